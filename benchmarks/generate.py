@@ -0,0 +1,57 @@
+"""Synthetic docs trees for the benchmarks."""
+
+import os
+
+
+def _write_pages(folder, count, prefix="page"):
+    os.makedirs(folder, exist_ok=True)
+    for i in range(count):
+        with open(os.path.join(folder, f"{prefix}-{i}.md"), "w") as f:
+            f.write(f"# {prefix} {i}\n\nSome content.\n")
+
+
+def wide_tree(root, folders=2000, pages=10):
+    """Many sibling folders directly below the root."""
+    for i in range(folders):
+        _write_pages(os.path.join(root, f"folder-{i}"), pages)
+
+
+def deep_tree(root, depth=60, pages=5):
+    """A single chain of nested folders."""
+    folder = root
+    for i in range(depth):
+        folder = os.path.join(folder, f"level-{i}")
+        _write_pages(folder, pages)
+
+
+def large_tree(root, pages=100000, fanout=10, per_folder=100):
+    """`pages` pages spread over a balanced tree of folders."""
+    folders = max(1, pages // per_folder)
+    for i in range(folders):
+        parts = []
+        n = i
+        while True:
+            parts.append(f"d{n % fanout}")
+            n //= fanout
+            if not n:
+                break
+        _write_pages(os.path.join(root, *reversed(parts), f"leaf-{i}"), per_folder)
+
+
+def exclusion_patterns(count=200):
+    """Patterns that mostly do not match, as in real configurations."""
+    patterns = ["docs/mkdocs/**", "docs/index.md"]
+    patterns += [f"docs/**/generated-{i}/**" for i in range(count // 2)]
+    patterns += [f"docs/folder-{i}/*.tmp" for i in range(count - len(patterns))]
+    return patterns
+
+
+def asset_tree(root, folders=50, files=100, size=4096):
+    """An additional index folder holding pages and binary assets."""
+    payload = os.urandom(size)
+    for i in range(folders):
+        folder = os.path.join(root, f"assets-{i}")
+        _write_pages(folder, files // 2)
+        for j in range(files // 2):
+            with open(os.path.join(folder, f"blob-{j}.bin"), "wb") as f:
+                f.write(payload)
@@ -0,0 +1,193 @@
+"""Benchmark the plugin on synthetic docs trees.
+
+Usage:
+    python benchmarks/run.py [--scale 0.1] [--only wide,deep]
+                             [--save results.json] [--compare baseline.json]
+"""
+
+import argparse
+import builtins
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import generate  # noqa: E402
+from mkdocs.structure.files import File, Files  # noqa: E402
+from mkdocs_breadcrumbs_plugin.plugin import BreadCrumbs  # noqa: E402
+
+# Filesystem calls counted while on_files runs
+COUNTED_CALLS = [
+    (os, "scandir"),
+    (os, "listdir"),
+    (os, "stat"),
+    (os, "lstat"),
+    (os, "replace"),
+    (os, "link"),
+    (os, "symlink"),
+    (builtins, "open"),
+    (shutil, "copy2"),
+]
+
+
+class Page:
+    """The attributes of a mkdocs Page read by the plugin."""
+
+    def __init__(self, file):
+        self.file = file
+        self.url = file.url
+        self.title = file.name
+        self.is_homepage = file.src_uri == "index.md"
+        self.is_page = True
+        self.is_section = False
+        self.parent = None
+
+
+def _scenarios(scale):
+    def n(value):
+        return max(1, int(value * scale))
+
+    return {
+        "wide": (lambda root: generate.wide_tree(root, folders=n(2000)), {}),
+        "deep": (lambda root: generate.deep_tree(root, depth=n(60)), {}),
+        "pages_100k": (lambda root: generate.large_tree(root, pages=n(100000)), {}),
+        "exclusions": (
+            lambda root: generate.wide_tree(root, folders=n(2000)),
+            {"exclude_paths": generate.exclusion_patterns(200)},
+        ),
+        "additional_folders": (
+            lambda root: generate.wide_tree(root, folders=n(100)),
+            {"additional_index_folders": ["assets"]},
+        ),
+    }
+
+
+def _count_calls():
+    counts = {}
+    patchers = []
+    for module, name in COUNTED_CALLS:
+        original = getattr(module, name)
+
+        def counted(*args, _original=original, _name=name, **kwargs):
+            counts[_name] = counts.get(_name, 0) + 1
+            return _original(*args, **kwargs)
+
+        patchers.append(mock.patch.object(module, name, counted))
+    return counts, patchers
+
+
+def run_scenario(name, build_tree, options, scale):
+    with tempfile.TemporaryDirectory() as tmp:
+        docs_dir = os.path.join(tmp, "docs")
+        os.makedirs(docs_dir)
+        build_tree(docs_dir)
+        if options.get("additional_index_folders"):
+            generate.asset_tree(
+                os.path.join(tmp, "assets"), folders=max(1, int(50 * scale))
+            )
+        config = {
+            "docs_dir": docs_dir,
+            "site_dir": os.path.join(tmp, "site"),
+            "site_url": "",
+            "use_directory_urls": True,
+            "config_file_path": os.path.join(tmp, "mkdocs.yml"),
+        }
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            plugin = BreadCrumbs()
+            errors, _ = plugin.load_config(dict(options, log_level="WARNING"))
+            if errors:
+                raise SystemExit(f"Invalid options for {name}: {errors}")
+            plugin.on_config(config)
+
+            counts, patchers = _count_calls()
+            tracemalloc.start()
+            for patcher in patchers:
+                patcher.start()
+            start = time.perf_counter()
+            plugin.on_files(Files([]), config)
+            on_files_seconds = time.perf_counter() - start
+            for patcher in patchers:
+                patcher.stop()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            pages = []
+            for root, _, names in os.walk(docs_dir):
+                for filename in names:
+                    if filename.endswith(".md"):
+                        src = os.path.relpath(os.path.join(root, filename), docs_dir)
+                        pages.append(
+                            Page(File(src, docs_dir, config["site_dir"], True))
+                        )
+            start = time.perf_counter()
+            for page in pages:
+                plugin.on_page_markdown("# Content\n", page, config, None)
+            markdown_seconds = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+
+    return {
+        "on_files_seconds": round(on_files_seconds, 4),
+        "on_files_peak_bytes": peak,
+        "fs_calls": dict(sorted(counts.items())),
+        "pages": len(pages),
+        "pages_per_second": round(len(pages) / markdown_seconds) if pages else 0,
+    }
+
+
+def _compare(results, baseline):
+    print(
+        f"\n{'scenario':<20} {'metric':<20} {'baseline':>12} {'now':>12} {'ratio':>7}"
+    )
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for metric in ("on_files_seconds", "on_files_peak_bytes", "pages_per_second"):
+            old, new = before[metric], result[metric]
+            ratio = new / old if old else float("inf")
+            print(f"{name:<20} {metric:<20} {old:>12} {new:>12} {ratio:>7.2f}")
+        old, new = sum(before["fs_calls"].values()), sum(result["fs_calls"].values())
+        ratio = new / old if old else float("inf")
+        print(f"{name:<20} {'fs_calls':<20} {old:>12} {new:>12} {ratio:>7.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--only", default="")
+    parser.add_argument("--save")
+    parser.add_argument("--compare")
+    args = parser.parse_args()
+
+    scenarios = _scenarios(args.scale)
+    selected = args.only.split(",") if args.only else list(scenarios)
+    results = {}
+    for name in selected:
+        build_tree, options = scenarios[name]
+        results[name] = run_scenario(name, build_tree, options, args.scale)
+        print(name, json.dumps(results[name]))
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"scale": args.scale, "results": results}, f, indent=2)
+            f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get("scale") != args.scale:
+            print(f"Warning: baseline was recorded at scale {baseline.get('scale')}")
+        _compare(results, baseline["results"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+import json
+import os
+from urllib.parse import unquote
+
+from .utils import atomic_write
+
+
+class CrumbNode:
+    """A URL path segment with its crumb and trail rendered once."""
+
+    __slots__ = ("parent", "children", "path", "title", "url", "crumb", "trail")
+
+    def __init__(self, parent=None, part="", base_url="", delimiter=""):
+        self.parent = parent
+        self.children = {}
+        self.title = unquote(part)
+        if parent is None:
+            # The root stands for the site itself and renders no crumb.
+            self.path = self.url = self.crumb = self.trail = ""
+            return
+        top_level = parent.parent is None
+        self.path = part if top_level else f"{parent.path}/{part}"
+        self.url = f"{base_url}/{self.path}"
+        self.crumb = f"[{self.title}]({self.url})"
+        self.trail = self.crumb if top_level else parent.trail + delimiter + self.crumb
+
+    def chain(self):
+        """Return the nodes from the top-level segment down to this one."""
+        nodes = []
+        node = self
+        while node.parent is not None:
+            nodes.append(node)
+            node = node.parent
+        nodes.reverse()
+        return nodes
+
+
+class CrumbTrie:
+    """Prefix trie of page URLs shared by all pages of a build.
+
+    Each segment's crumb and the trail leading to it are rendered when the
+    segment is first inserted, so sibling pages reuse their common prefix."""
+
+    def __init__(self, base_url, delimiter):
+        self.base_url = base_url
+        self.delimiter = delimiter
+        self.root = CrumbNode()
+        self.pages = {}
+
+    def lookup(self, url):
+        """Return the node of `url`, inserting its missing segments."""
+        node = self.pages.get(url)
+        if node is not None:
+            return node
+        node = self.root
+        for part in url.strip("/").split("/"):
+            child = node.children.get(part)
+            if child is None:
+                child = CrumbNode(node, part, self.base_url, self.delimiter)
+                node.children[part] = child
+            node = child
+        self.pages[url] = node
+        return node
+
+
+class NavNode:
+    """A nav item that shows up in the breadcrumbs of the pages below it."""
+
+    __slots__ = ("parent", "title", "url", "trail")
+
+    def __init__(self, parent, title, url, trail):
+        self.parent = parent
+        self.title = title
+        self.url = url
+        self.trail = trail
+
+    def crumbs(self):
+        """Return the (title, url) crumbs from the top-level item down to
+        this one."""
+        crumbs = []
+        node = self
+        while node is not None:
+            crumbs.append((node.title, node.url))
+            node = node.parent
+        crumbs.reverse()
+        return crumbs
+
+
+class NavIndex:
+    """Compact records of the nav items of a build.
+
+    `nodes` maps the id of a nav item to its NavNode, whose trail holds the
+    joined crumbs of the item and its ancestors; the items are kept alive so
+    their ids cannot be reused during the build. `pages` maps the URL of a
+    page in the nav to the NavNode of its parent, or None at the top level."""
+
+    def __init__(self, delimiter):
+        self.delimiter = delimiter
+        self.nodes = {}
+        self.pages = {}
+        self._items = []
+
+    def add(self, item, parent, crumb):
+        """Record `item` below the NavNode `parent` and return its node; an
+        item without a crumb shares the node of its parent."""
+        if crumb is None:
+            node = parent
+        else:
+            title, url = crumb
+            text = title if url is None else f"[{title}]({url})"
+            trail = text if parent is None else parent.trail + self.delimiter + text
+            node = NavNode(parent, title, url, trail)
+        self.nodes[id(item)] = node
+        self._items.append(item)
+        return node
+
+
+class BreadcrumbCache:
+    """Breadcrumbs of pages persisted between builds.
+
+    `pages` maps a page URL to its (title, url) crumbs below the home link.
+    Stored crumbs are only trusted while the key they were saved under, a
+    hash of everything that shapes them, stays the same. Only pages looked up
+    during the current build are written back by `save`."""
+
+    def __init__(self, path):
+        self.path = path
+        self.key = None
+        self.pages = {}
+        self.seen = {}
+        self.misses = 0
+
+    def load(self, key):
+        """Trust the stored crumbs if they were saved under `key` and return
+        whether they were."""
+        self.key = key
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("key") != key:
+            return False
+        self.pages = data.get("pages", {})
+        return True
+
+    def get(self, url, render):
+        """Return the crumbs of the page at `url`, calling `render` on a miss."""
+        crumbs = self.seen.get(url)
+        if crumbs is None:
+            crumbs = self.pages.get(url)
+            if crumbs is None:
+                crumbs = [list(crumb) for crumb in render()]
+                self.misses += 1
+            self.seen[url] = crumbs
+        return crumbs
+
+    def save(self):
+        # Nothing to write if every page hit and none disappeared
+        if not self.misses and len(self.seen) == len(self.pages):
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = json.dumps({"key": self.key, "pages": self.seen})
+        atomic_write(self.path, data.encode("utf-8"))
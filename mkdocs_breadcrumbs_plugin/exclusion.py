@@ -0,0 +1,112 @@
+import os
+import re
+
+
+def _translate_set(pattern, i, j):
+    """Translate the bracket expression `pattern[i:j]` the way fnmatch does."""
+    negated = pattern[i] == "!"
+    start = i + 1 if negated else i
+    # Split on the hyphens of ranges, dropping empty ranges such as `z-a`
+    chunks = []
+    k = start + 1
+    while True:
+        k = pattern.find("-", k, j)
+        if k < 0:
+            break
+        chunks.append(pattern[start:k])
+        start = k + 1
+        k += 3
+    chunk = pattern[start:j]
+    if chunk:
+        chunks.append(chunk)
+    else:
+        chunks[-1] += "-"
+    for k in range(len(chunks) - 1, 0, -1):
+        if chunks[k - 1][-1] > chunks[k][0]:
+            chunks[k - 1] = chunks[k - 1][:-1] + chunks[k][1:]
+            del chunks[k]
+    chars = "-".join(c.replace("\\", "\\\\").replace("-", "\\-") for c in chunks)
+    chars = re.sub(r"([&~|])", r"\\\1", chars)
+    if not chars:
+        # An empty range matches nothing, or anything when negated
+        return "." if negated else "(?!)"
+    if negated:
+        return f"[^{chars}]"
+    if chars.startswith("^"):
+        chars = "\\" + chars
+    return f"[{chars}]"
+
+
+def translate(pattern):
+    """Translate a glob pattern into a regular expression.
+
+    Like fnmatch, `*` and `?` also match `/`. A `**/` additionally matches zero
+    or more leading directories, so `**/drafts/**` matches `drafts/page.md`."""
+    i, n = 0, len(pattern)
+    parts = []
+    while i < n:
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+            continue
+        c = pattern[i]
+        i += 1
+        if c == "*":
+            while i < n and pattern[i] == "*" and not pattern.startswith("**/", i):
+                i += 1
+            parts.append(".*")
+        elif c == "?":
+            parts.append(".")
+        elif c == "[":
+            # Like fnmatch, a `]` right after `[` or `[!` is part of the set
+            j = i
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            j = pattern.find("]", j)
+            if j == -1:
+                parts.append("\\[")
+                continue
+            parts.append(_translate_set(pattern, i, j))
+            i = j + 1
+        else:
+            parts.append(re.escape(c))
+    return "".join(parts)
+
+
+class ExclusionMatcher:
+    """Match paths against `exclude_paths` with one compiled expression.
+
+    Patterns are relative to `root`; a leading `docs/` is ignored. Decisions
+    are cached per path for the lifetime of the matcher."""
+
+    def __init__(self, patterns, root):
+        self.root = root
+        self.cache = {}
+        self.hits = 0
+        normalized = [
+            pattern.replace("docs/", "", 1) if pattern.startswith("docs/") else pattern
+            for pattern in patterns
+        ]
+        flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+        if normalized:
+            expression = "|".join(f"(?:{translate(p)})" for p in normalized)
+            self._match = re.compile(f"(?s:{expression})\\Z", flags).match
+        else:
+            self._match = None
+
+    def __call__(self, path):
+        excluded = self.cache.get(path)
+        if excluded is not None:
+            self.hits += 1
+        else:
+            excluded = self.match_relative(
+                os.path.relpath(path, self.root).replace(os.sep, "/")
+            )
+            self.cache[path] = excluded
+        return excluded
+
+    def match_relative(self, relative_path):
+        """Return whether a `/`-separated path relative to the root is excluded."""
+        return self._match is not None and self._match(relative_path) is not None
@@ -0,0 +1,88 @@
+import json
+import os
+import threading
+
+from .utils import atomic_write
+
+
+def _fingerprint(path):
+    stat = os.lstat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+class ArtifactLedger:
+    """Files and directories the plugin created in docs_dir, persisted between
+    builds so they can be removed again.
+
+    Each file is recorded with the mtime and size it had right after it was
+    written. `sweep` only deletes files that still match, so anything edited
+    or replaced since is left in place and forgotten. Recorded directories
+    are only removed once empty and stay recorded until then. Recording may
+    run on several threads."""
+
+    def __init__(self, path):
+        self.path = path
+        self.files = {}
+        self.dirs = set()
+        self._lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.files = data.get("files", {})
+        self.dirs = set(data.get("dirs", []))
+
+    def add(self, path, existed=False):
+        """Record the file just written at `path` and return whether it was
+        recorded. A file that `existed` before the write is only recorded if
+        it was recorded already, so hand-written files are never swept."""
+        fingerprint = _fingerprint(path)
+        with self._lock:
+            if existed and path not in self.files:
+                return False
+            self.files[path] = fingerprint
+        return True
+
+    def discard(self, path):
+        """Forget the file at `path`, e.g. once it was removed."""
+        with self._lock:
+            self.files.pop(path, None)
+
+    def add_dir(self, path):
+        """Record the directory just created at `path`."""
+        with self._lock:
+            self.dirs.add(path)
+
+    def sweep(self):
+        """Remove the recorded artifacts and return how many files were
+        removed and how many were kept because they changed."""
+        removed = kept = 0
+        for path, fingerprint in sorted(self.files.items()):
+            try:
+                if _fingerprint(path) != fingerprint:
+                    kept += 1
+                    continue
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+        # Deepest first, so emptied parents can go too
+        remaining = set()
+        for path in sorted(self.dirs, reverse=True):
+            try:
+                os.rmdir(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                remaining.add(path)
+        self.files = {}
+        self.dirs = remaining
+        return removed, kept
+
+    def save(self):
+        data = {"files": self.files, "dirs": sorted(self.dirs)}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        atomic_write(self.path, json.dumps(data).encode("utf-8"))
@@ -0,0 +1,64 @@
+import hashlib
+import json
+import os
+
+from .utils import atomic_write
+
+
+def content_hash(content):
+    """Return the hex digest used to recognise generated content."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def is_generated(path, digest):
+    """Return whether the file at `path` still has the content hash `digest`."""
+    if digest is None:
+        return False
+    try:
+        with open(path, encoding="utf-8") as f:
+            return content_hash(f.read()) == digest
+    except (OSError, ValueError):
+        return False
+
+
+class Manifest:
+    """Directory listings and generated index hashes persisted between builds.
+
+    `listings` is read and updated by `scan_tree`, `indexes` maps a directory
+    to the hash of the index page generated for it. Only directories marked as
+    `seen` during the current build are written back by `save`."""
+
+    def __init__(self, path, key):
+        self.path = path
+        self.key = key
+        self.listings = {}
+        self.indexes = {}
+        self.seen = set()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.indexes = data.get("indexes", {})
+        # Listings are only trusted if the configuration did not change.
+        if data.get("key") == self.key:
+            self.listings = data.get("listings", {})
+
+    def keep(self, root):
+        """Mark `root` and every directory below it as seen without rescanning
+        them, so their entries survive `save`."""
+        prefix = os.path.join(root, "")
+        for path in list(self.listings) + list(self.indexes):
+            if path == root or path.startswith(prefix):
+                self.seen.add(path)
+
+    def save(self):
+        data = {
+            "key": self.key,
+            "listings": {p: self.listings[p] for p in self.seen if p in self.listings},
+            "indexes": {p: self.indexes[p] for p in self.seen if p in self.indexes},
+        }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        atomic_write(self.path, json.dumps(data).encode("utf-8"))
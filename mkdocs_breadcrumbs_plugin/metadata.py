@@ -0,0 +1,108 @@
+import json
+import os
+import re
+import threading
+
+import yaml
+
+from .utils import atomic_write
+
+# Bytes read from the start of a page to find its title and description
+HEAD_SIZE = 4096
+
+FRONT_MATTER_RE = re.compile(
+    r"\A---[ \t]*\r?\n(.*?)^(?:---|\.\.\.)[ \t]*\r?$", re.S | re.M
+)
+HEADING_RE = re.compile(r"^#[ \t]+(.+?)[ \t#]*$", re.M)
+
+
+def read_page_meta(path, head_size=HEAD_SIZE):
+    """Return the title and description of a Markdown page, or None for each.
+
+    Only the first `head_size` bytes are read. The title comes from the
+    `title` front matter key or else the first level-one heading, the
+    description from the `description` front matter key."""
+    with open(path, "rb") as f:
+        head = f.read(head_size).decode("utf-8", errors="replace")
+    title = description = None
+    match = FRONT_MATTER_RE.match(head)
+    if match is not None:
+        try:
+            meta = yaml.safe_load(match.group(1))
+        except yaml.YAMLError:
+            meta = None
+        if isinstance(meta, dict):
+            title = meta.get("title")
+            description = meta.get("description")
+        end = match.end()
+        head = head[end:]
+    if not title:
+        heading = HEADING_RE.search(head)
+        title = heading.group(1) if heading is not None else None
+    return (
+        " ".join(str(title).split()) if title else None,
+        " ".join(str(description).split()) if description else None,
+    )
+
+
+class PageMetaCache:
+    """Page titles and descriptions persisted between builds.
+
+    Entries are keyed by path and only trusted while the file keeps the mtime
+    and size it had when read. Entries not used during the current build
+    belong to pages that disappeared and are dropped by `save`. Lookups may
+    run on several threads."""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.seen = {}
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.entries = data.get("entries", {})
+
+    def _current_entry(self, path):
+        """Return the stat key of `path` and its cached entry if still valid."""
+        stat = os.stat(path)
+        key = [stat.st_mtime_ns, stat.st_size]
+        entry = self.seen.get(path) or self.entries.get(path)
+        if entry is not None and entry[:2] == key:
+            self.seen[path] = entry
+            return key, entry
+        return key, None
+
+    def is_current(self, path):
+        """Return whether the cached entry of `path` is still valid."""
+        try:
+            return self._current_entry(path)[1] is not None
+        except OSError:
+            return False
+
+    def get(self, path):
+        """Return the title and description of `path`, reading its head on a
+        miss; both are None if the file cannot be read."""
+        try:
+            key, entry = self._current_entry(path)
+            if entry is None:
+                entry = key + list(read_page_meta(path))
+                with self._lock:
+                    self.seen[path] = entry
+                    self.misses += 1
+        except OSError:
+            return None, None
+        return entry[2], entry[3]
+
+    def save(self):
+        # Nothing to write if every page hit and none disappeared
+        if not self.misses and len(self.seen) == len(self.entries):
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = json.dumps({"entries": self.seen})
+        atomic_write(self.path, data.encode("utf-8"))
@@ -0,0 +1,161 @@
+import json
+import os
+import shutil
+import stat
+import threading
+
+from .utils import atomic_write
+
+MIRROR_MODES = ("copy", "hardlink", "reflink", "symlink")
+
+# ioctl request number of FICLONE on Linux
+_FICLONE = 0x40049409
+
+
+def _fingerprint(stat_result):
+    return [stat_result.st_mtime_ns, stat_result.st_size]
+
+
+def load_owned(path):
+    """Return the destinations a Mirror placed in earlier builds."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("owned", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_owned(path, owned):
+    """Persist the destinations of `owned` that still exist."""
+    data = {"owned": {p: f for p, f in owned.items() if os.path.lexists(p)}}
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    atomic_write(path, json.dumps(data).encode("utf-8"))
+
+
+def _clone(src, dest):
+    """Create `dest` as a copy-on-write clone of `src`."""
+    import fcntl
+
+    with open(src, "rb") as src_file, open(dest, "wb") as dest_file:
+        fcntl.ioctl(dest_file.fileno(), _FICLONE, src_file.fileno())
+    shutil.copystat(src, dest)
+
+
+class MirrorStats:
+    """Counters of a mirroring run."""
+
+    def __init__(self):
+        self.copied = 0
+        self.linked = 0
+        self.unchanged = 0
+        self.kept = 0
+        self.bytes_copied = 0
+        self.bytes_saved = 0
+
+    def __str__(self):
+        return (
+            f"{self.copied} copied, {self.linked} linked, "
+            f"{self.unchanged} unchanged, {self.kept} kept, "
+            f"{self.bytes_copied} bytes copied, {self.bytes_saved} bytes saved"
+        )
+
+
+class Mirror:
+    """Keep destination files in sync with their sources.
+
+    A destination with the same size and mtime as its source, or already
+    linked to it, is left alone. Missing destinations are created and
+    recorded in `owned` with the mtime and size they had once placed. An
+    existing destination is only replaced while it is still recorded there
+    unchanged; any other one, e.g. a hand-written page in docs_dir, is kept.
+    Depending on `mode`, files are copied, hardlinked, reflinked or symlinked.
+    Links that cannot be created, e.g. across devices, fall back to a copy.
+    `sync` may run on several threads."""
+
+    def __init__(self, mode="copy", owned=None):
+        if mode not in MIRROR_MODES:
+            raise ValueError(f"Invalid mirror mode: {mode}")
+        self.mode = mode
+        self.owned = {} if owned is None else owned
+        self.stats = MirrorStats()
+        self._lock = threading.Lock()
+
+    def owns(self, dest, dest_stat=None):
+        """Return whether `dest` was placed by a mirror and not touched since."""
+        fingerprint = self.owned.get(dest)
+        if fingerprint is None:
+            return False
+        try:
+            dest_stat = dest_stat or os.lstat(dest)
+        except OSError:
+            return False
+        return _fingerprint(dest_stat) == fingerprint
+
+    def remove(self, dest):
+        """Remove `dest` if it is still the file a mirror placed there and
+        return whether it was removed."""
+        if not self.owns(dest):
+            return False
+        os.remove(dest)
+        with self._lock:
+            self.owned.pop(dest, None)
+        return True
+
+    def _count(self, action, bytes_copied=0, bytes_saved=0):
+        with self._lock:
+            setattr(self.stats, action, getattr(self.stats, action) + 1)
+            self.stats.bytes_copied += bytes_copied
+            self.stats.bytes_saved += bytes_saved
+
+    def sync(self, src, dest):
+        """Mirror `src` to `dest` and return what was done."""
+        src_stat = os.stat(src)
+        try:
+            dest_stat = os.lstat(dest)
+        except FileNotFoundError:
+            dest_stat = None
+        if dest_stat is not None:
+            if self._is_current(src, src_stat, dest, dest_stat):
+                self._count("unchanged", bytes_saved=src_stat.st_size)
+                return "unchanged"
+            if not self.owns(dest, dest_stat):
+                self._count("kept")
+                return "kept"
+        return self._place(src, dest, src_stat.st_size)
+
+    def _is_current(self, src, src_stat, dest, dest_stat):
+        if stat.S_ISLNK(dest_stat.st_mode):
+            return os.readlink(dest) == os.path.abspath(src)
+        same_size = dest_stat.st_size == src_stat.st_size
+        return same_size and dest_stat.st_mtime_ns == src_stat.st_mtime_ns
+
+    def _place(self, src, dest, size):
+        tmp_path = os.path.join(
+            os.path.dirname(dest), f".{os.path.basename(dest)}.mirror.tmp"
+        )
+        linked = self.mode != "copy" and self._link(src, tmp_path)
+        if not linked:
+            shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, dest)
+        fingerprint = _fingerprint(os.lstat(dest))
+        with self._lock:
+            self.owned[dest] = fingerprint
+        if linked:
+            self._count("linked", bytes_saved=size)
+            return "linked"
+        self._count("copied", bytes_copied=size)
+        return "copied"
+
+    def _link(self, src, tmp_path):
+        try:
+            if self.mode == "symlink":
+                os.symlink(os.path.abspath(src), tmp_path)
+            elif self.mode == "hardlink":
+                os.link(src, tmp_path)
+            else:
+                _clone(src, tmp_path)
+            return True
+        except (OSError, ImportError):
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+            return False
@@ -1,16 +1,64 @@
+import bisect
+import heapq
+import html
+import json
 import os
-import shutil
+import posixpath
 import logging
-import fnmatch
+import re
+import threading
+import time
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from mkdocs.config import config_options
 from mkdocs.plugins import BasePlugin
-from urllib.parse import unquote
+from mkdocs.structure.files import File
+from urllib.parse import urljoin
+
+from .breadcrumbs import BreadcrumbCache, CrumbTrie, NavIndex
+from .exclusion import ExclusionMatcher
+from .ledger import ArtifactLedger
+from .metadata import PageMetaCache
+from .manifest import Manifest, content_hash, is_generated
+from .mirror import MIRROR_MODES, Mirror, load_owned, save_owned
+from .profiling import Profiler
+from .scanner import scan_directory, scan_tree
+from .utils import atomic_write, write_lines_if_changed
+
+
+class LazyFile(File):
+    """A generated file whose content is rendered on first access."""
+
+    _render = None
+    _rendered = None
+
+    @property
+    def _content(self):
+        if self._render is not None:
+            self._rendered = self._render()
+            self._render = None
+        return self._rendered
+
+    @_content.setter
+    def _content(self, value):
+        self._render = None
+        self._rendered = value
+
+
+LOG_HANDLER_NAME = "mkdocs-breadcrumbs-plugin"
+INDEX_PAGE_RE = re.compile(r"index-(\d+)\.md$")
+# Methods timed individually when profiling
+PROFILED_METHODS = ("_copy_all_to_docs", "_mirror_file", "_is_path_excluded")
+# Breadcrumb HTML is inserted after the first tag matching one of these, in order
+HTML_ANCHORS = (re.compile(r"<article\b[^>]*>"), re.compile(r"<body\b[^>]*>"))
 
 
 class BreadCrumbs(BasePlugin):
 
     config_scheme = (
         ("log_level", config_options.Type(str, default="INFO")),
+        ("log_summary", config_options.Type(bool, default=False)),
         ("delimiter", config_options.Type(str, default=" / ")),
         ("base_url", config_options.Type(str, default="")),
         (
@@ -19,10 +67,47 @@ class BreadCrumbs(BasePlugin):
         ),
         ("additional_index_folders", config_options.Type(list, default=[])),
         ("generate_home_index", config_options.Type(bool, default=True)),
+        ("home_index_depth", config_options.Type(int, default=3)),
         ("use_page_titles", config_options.Type(bool, default=False)),
         ("home_text", config_options.Type(str, default="Home")),
+        ("json_ld", config_options.Type(bool, default=False)),
+        ("breadcrumbs_json", config_options.Type(str, default="")),
+        ("virtual_index_pages", config_options.Type(bool, default=False)),
+        (
+            "output",
+            config_options.Choice(("markdown", "context", "html"), default="markdown"),
+        ),
+        ("mirror_mode", config_options.Choice(MIRROR_MODES, default="copy")),
+        ("rich_index", config_options.Type(bool, default=False)),
+        ("index_page_size", config_options.Type(int, default=0)),
+        ("workers", config_options.Type(int, default=1)),
+        ("incremental", config_options.Type(bool, default=False)),
+        ("cache_breadcrumbs", config_options.Type(bool, default=False)),
+        ("cleanup_artifacts", config_options.Type(bool, default=False)),
+        ("watch_debounce", config_options.Type((int, float), default=0.1)),
+        ("cache_dir", config_options.Type(str, default=".cache/breadcrumbs")),
+        ("profile", config_options.Type(bool, default=False)),
+        ("profile_json", config_options.Type(str, default="")),
     )
 
+    command = None
+    ledger = None
+    swept = False
+    docs_written = docs_removed = None
+    generated_indexes = None
+    watched_folders = ()
+    watch_handlers = ()
+
+    def __init__(self):
+        super().__init__()
+        # Serializes on_files with regenerations triggered by the serve watcher
+        self._regenerate_lock = threading.Lock()
+        # Last scanned tree of docs_dir and each additional folder
+        self.folder_trees = {}
+
+    def on_startup(self, command, dirty, **kwargs):
+        self.command = command
+
     def _setup_logger(self):
         self.logger = logging.getLogger("mkdocs.plugins.breadcrumbs")
         log_level = self.config["log_level"].upper()
@@ -30,14 +115,24 @@ class BreadCrumbs(BasePlugin):
         if not isinstance(numeric_level, int):
             raise ValueError(f"Invalid log level: {log_level}")
         self.logger.setLevel(numeric_level)
-        handler = logging.StreamHandler()
-        handler.setLevel(numeric_level)
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        # on_config runs again on every rebuild of mkdocs serve; reuse our handler
+        handler = next(
+            (h for h in self.logger.handlers if h.get_name() == LOG_HANDLER_NAME),
+            None,
         )
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
-        self.logger.info(f"Log level set to {log_level}")
+        if handler is None:
+            handler = logging.StreamHandler()
+            handler.set_name(LOG_HANDLER_NAME)
+            formatter = logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+            )
+            handler.setFormatter(formatter)
+            self.logger.addHandler(handler)
+        handler.setLevel(numeric_level)
+        self.log_summary = self.config["log_summary"]
+        # Per-page and per-index messages drop to DEBUG in summary mode
+        self.detail_level = logging.DEBUG if self.log_summary else logging.INFO
+        self.logger.info("Log level set to %s", log_level)
 
     def _get_base_url(self, config):
         site_url = config.get("site_url", "")
@@ -49,198 +144,1044 @@ class BreadCrumbs(BasePlugin):
         base_url = "/" + parsed_url.split("/", 1)[1] if "/" in parsed_url else ""
         return base_url.rstrip("/")
 
+    def _index_settings(self):
+        """Return the settings that affect generated index pages; incremental
+        listings are only trusted while these stay the same."""
+        return (
+            self.base_url,
+            self.exclude_paths,
+            self.index_page_size,
+            self.generate_home_index,
+            self.home_index_depth,
+            self.config["rich_index"],
+        )
+
+    def _resolve_path(self, config, path):
+        """Resolve `path` relative to the directory of mkdocs.yaml."""
+        config_file_path = config.get("config_file_path")
+        if os.path.isabs(path) or not config_file_path:
+            return path
+        return os.path.join(os.path.dirname(config_file_path), path)
+
     def on_config(self, config, **kwargs):
+        start = time.perf_counter()
         self._setup_logger()
         self.base_url = self._get_base_url(config)
         self.docs_dir = config["docs_dir"]
         self.additional_index_folders = self.config["additional_index_folders"]
         self.exclude_paths = self.config["exclude_paths"]
+        self.exclusion_matcher = ExclusionMatcher(self.exclude_paths, self.docs_dir)
         self.generate_home_index = self.config["generate_home_index"]
+        self.home_index_depth = self.config["home_index_depth"]
+        if self.home_index_depth < 0:
+            raise ValueError(f"Invalid home index depth: {self.home_index_depth}")
+        self.output = self.config["output"]
+        self.json_ld = self.config["json_ld"]
+        self.site_breadcrumbs = {} if self.config["breadcrumbs_json"] else None
+        self.virtual_index_pages = self.config["virtual_index_pages"]
+        if self.virtual_index_pages and not hasattr(File, "generated"):
+            raise ValueError("virtual_index_pages requires mkdocs>=1.6")
+        self.index_page_size = self.config["index_page_size"]
+        if self.index_page_size < 0:
+            raise ValueError(f"Invalid index page size: {self.index_page_size}")
+        self.workers = self.config["workers"]
+        if self.workers < 1:
+            raise ValueError(f"Invalid number of workers: {self.workers}")
+        self.executor = None
+        self.crumb_trie = None
+        self.nav_index = NavIndex(self.config["delimiter"])
+        self.breadcrumb_cache = None
+        if self.config["cache_breadcrumbs"]:
+            self.breadcrumb_cache = BreadcrumbCache(
+                os.path.join(
+                    self._resolve_path(config, self.config["cache_dir"]),
+                    "breadcrumbs.json",
+                )
+            )
+            # URL breadcrumbs only depend on the page URL; title breadcrumbs
+            # also on the nav, so their cache is loaded in on_nav
+            if not self.config["use_page_titles"]:
+                self.breadcrumb_cache.load(self._breadcrumb_key())
+        self.page_count = 0
+        self.index_written = 0
+        self.index_unchanged = 0
+        self.manifest = None
+        if self.config["incremental"]:
+            self.manifest = Manifest(
+                os.path.join(
+                    self._resolve_path(config, self.config["cache_dir"]),
+                    "manifest.json",
+                ),
+                content_hash(repr(self._index_settings())),
+            )
+            self.manifest.load()
+            self.generated_indexes = self.manifest.indexes
+        elif self.generated_indexes is None:
+            # Without a manifest, only indexes written by this process (e.g.
+            # earlier serve rebuilds) are known as generated.
+            self.generated_indexes = {}
         self.logger.info(
-            f"Configuration: base_url={self.base_url}, "
-            f"additional_index_folders={self.additional_index_folders}, "
-            f"exclude_paths={self.exclude_paths}, "
-            f"generate_home_index={self.generate_home_index}"
+            "Configuration: base_url=%s, additional_index_folders=%s, "
+            "exclude_paths=%s, generate_home_index=%s, virtual_index_pages=%s, "
+            "workers=%s, incremental=%s, log_summary=%s",
+            self.base_url,
+            self.additional_index_folders,
+            self.exclude_paths,
+            self.generate_home_index,
+            self.virtual_index_pages,
+            self.workers,
+            self.manifest is not None,
+            self.log_summary,
+        )
+        self.ledger = None
+        if self.config["cleanup_artifacts"]:
+            self.ledger = ArtifactLedger(
+                os.path.join(
+                    self._resolve_path(config, self.config["cache_dir"]),
+                    "ledger.json",
+                )
+            )
+            self.ledger.load()
+            # Artifacts left behind by an interrupted run; only swept once per
+            # process so `mkdocs serve` rebuilds do not rewrite docs_dir.
+            if not self.swept:
+                self.swept = True
+                self._sweep_artifacts("stale")
+        # Destinations placed by the mirror, which it alone may replace
+        self.mirror_state = os.path.join(
+            self._resolve_path(config, self.config["cache_dir"]), "mirror.json"
         )
+        self.mirror_owned = {}
+        if self.additional_index_folders and not self.virtual_index_pages:
+            self.mirror_owned = load_owned(self.mirror_state)
+        self.page_meta = None
+        if self.config["rich_index"]:
+            self.page_meta = PageMetaCache(
+                os.path.join(
+                    self._resolve_path(config, self.config["cache_dir"]),
+                    "page_meta.json",
+                )
+            )
+            self.page_meta.load()
+        self.profiler = None
+        # The instance outlives a build under `mkdocs serve`; always wrap the
+        # class methods so wrappers of earlier builds are dropped, not nested.
+        for name in PROFILED_METHODS:
+            self.__dict__.pop(name, None)
+        if self.config["profile"]:
+            self.profiler = Profiler()
+            self.profiler.record("on_config", time.perf_counter() - start)
+            for name in PROFILED_METHODS:
+                method = getattr(type(self), name).__get__(self)
+                setattr(self, name, self.profiler.wrap(name, method))
 
     def on_files(self, files, config, **kwargs):
-        self.logger.info(f"Generating index pages for docs_dir={self.docs_dir}")
-        self._generate_index_pages(self.docs_dir)
+        with self._timed("on_files"), self._regenerate_lock:
+            if self.workers > 1:
+                self.executor = ThreadPoolExecutor(max_workers=self.workers)
+            # Paths below docs_dir written or removed during this hook
+            self.docs_written, self.docs_removed = [], []
+            try:
+                self._generate_all_index_pages(files, config)
+                self._update_files(files, config)
+            finally:
+                self.docs_written = self.docs_removed = None
+                if self.executor is not None:
+                    self.executor.shutdown()
+                    self.executor = None
+            if self.manifest is not None:
+                self.manifest.save()
+            if self.ledger is not None:
+                self.ledger.save()
+            if self.additional_index_folders and not self.virtual_index_pages:
+                save_owned(self.mirror_state, self.mirror_owned)
+            if not self.config["use_page_titles"] and self.breadcrumb_cache is None:
+                crumb_trie = self._get_crumb_trie()
+                for file in files.documentation_pages():
+                    crumb_trie.lookup(file.url)
+            return files
+
+    def _update_files(self, files, config):
+        """Add the pages written to docs_dir to `files`, which MkDocs collected
+        before they existed, and drop the ones removed, so this build renders
+        them even if cleanup_artifacts removes them afterwards."""
+        for path in self.docs_removed:
+            file = files.get_file_from_path(self._docs_src_uri(path))
+            if file is not None:
+                files.remove(file)
+        for path in self.docs_written:
+            src_uri = self._docs_src_uri(path)
+            if files.get_file_from_path(src_uri) is None:
+                files.append(
+                    File(
+                        src_uri,
+                        self.docs_dir,
+                        config["site_dir"],
+                        config["use_directory_urls"],
+                    )
+                )
+
+    def _docs_src_uri(self, path):
+        """Return the URI of `path` relative to docs_dir, or None outside it."""
+        relpath = os.path.relpath(path, self.docs_dir)
+        if relpath.startswith(os.pardir):
+            return None
+        return relpath.replace(os.sep, "/")
+
+    def _generate_all_index_pages(self, files, config):
+        self.logger.info("Generating index pages for docs_dir=%s", self.docs_dir)
+        if self.virtual_index_pages:
+            self._add_virtual_index_pages(files, config, self.docs_dir)
+            for folder in self.additional_index_folders:
+                self.logger.info(
+                    "Adding virtual index pages for additional folder=%s", folder
+                )
+                self._add_virtual_index_pages(files, config, folder, mirror=True)
+            return
+        self.folder_trees[self.docs_dir] = self._generate_index_pages(self.docs_dir)
         for folder in self.additional_index_folders:
-            self.logger.info(f"Generating index pages for additional folder={folder}")
-            self._generate_index_pages(folder, move_to_docs=True)
+            if folder in self.watched_folders:
+                self.logger.info(
+                    "Additional folder=%s is kept in sync by on_serve", folder
+                )
+                if self.manifest is not None:
+                    self.manifest.keep(folder)
+                continue
+            self.logger.info("Generating index pages for additional folder=%s", folder)
+            self.mirror = Mirror(self.config["mirror_mode"], self.mirror_owned)
+            self.folder_trees[folder] = self._generate_index_pages(
+                folder, move_to_docs=True
+            )
+            self.logger.info("Mirrored folder=%s: %s", folder, self.mirror.stats)
+            if self.profiler is not None:
+                self.profiler.count("files_copied", self.mirror.stats.copied)
+                self.profiler.count("files_linked", self.mirror.stats.linked)
+                self.profiler.count("bytes_copied", self.mirror.stats.bytes_copied)
+                self.profiler.count("bytes_saved", self.mirror.stats.bytes_saved)
+        if self.generate_home_index:
+            self._write_home_index(self._home_index_changed())
+
+    def _timed(self, name):
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.timed(name)
+
+    def _map(self, func, items):
+        """Apply `func` to `items` on the worker pool, keeping their order."""
+        if self.executor is None:
+            return [func(item) for item in items]
+        return list(self.executor.map(func, items))
+
+    def _scan_tree(self, base_folder):
+        listings = self.manifest.listings if self.manifest is not None else None
+        tree = scan_tree(base_folder, self._is_path_excluded, listings, self.executor)
+        if self.profiler is not None:
+            for node in tree.walk():
+                self.profiler.count("directories_scanned")
+                if node.changed:
+                    self.profiler.count("directories_listed")
+        return tree
 
     def _generate_index_pages(self, base_folder, move_to_docs=False):
-        for dirpath, dirnames, filenames in os.walk(base_folder):
-            if self._is_path_excluded(dirpath):
-                self.logger.debug(f"Skipping excluded path: {dirpath}")
-                dirnames[:] = []  # Don't traverse any subdirectories
-                continue
+        with self._timed(f"_generate_index_pages[{base_folder}]"):
+            return self._generate_folder_index_pages(base_folder, move_to_docs)
 
-            if "index.md" not in filenames:
-                self.logger.debug(f"Generating index page for path={dirpath}")
-                self._generate_index_page(base_folder, dirpath)
-                if move_to_docs:
-                    self._copy_all_to_docs(base_folder, dirpath)
+    def _generate_folder_index_pages(self, base_folder, move_to_docs):
+        tree = self._scan_tree(base_folder)
+        nodes = list(tree.walk())
+        if self.generate_home_index and base_folder == self.docs_dir:
+            # The home index is written once every folder is scanned
+            self._update_nodes(nodes[1:], move_to_docs)
+        else:
+            self._update_nodes(nodes, move_to_docs)
+        return tree
 
-    def _is_path_excluded(self, path):
-        relative_path = os.path.relpath(path, self.docs_dir).replace(os.sep, "/")
-        self.logger.debug(
-            f"Checking if path is excluded: relative_path={relative_path}"
+    def _update_nodes(self, nodes, move_to_docs):
+        """Write the missing or stale index pages of scanned directories and
+        optionally mirror their files to docs_dir."""
+        pending = []
+        for node in nodes:
+            stale = False
+            if self.manifest is not None:
+                self.manifest.seen.add(node.path)
+            stale = node.path in self.generated_indexes and (
+                node.changed or self._page_meta_changed(node)
+            )
+            if "index.md" not in node.files or (stale and self._is_generated(node)):
+                self.logger.debug("Generating index page for path=%s", node.path)
+                pending.append(node)
+
+        results = self._map(self._write_index_page, pending)
+        for node, result in zip(pending, results):
+            self._record_index_page(node, *result)
+        if move_to_docs:
+            self._copy_all_to_docs(nodes)
+
+    def _is_generated(self, node):
+        """Return whether the index.md of `node` is still the one we generated."""
+        return is_generated(
+            os.path.join(node.path, "index.md"), self.generated_indexes.get(node.path)
         )
-        for pattern in self.exclude_paths:
-            normalized_pattern = (
-                pattern.replace("docs/", "", 1)
-                if pattern.startswith("docs/")
-                else pattern
-            )
-            if fnmatch.fnmatch(relative_path, normalized_pattern):
-                self.logger.debug(
-                    f"Excluding path={relative_path} based on pattern={pattern}"
-                )
-                return True
-        return False
 
-    def _generate_index_page(self, docs_dir, dirpath):
-        if self._is_path_excluded(dirpath):
-            return
-        relative_dir = os.path.relpath(dirpath, docs_dir)
-        content_lines = [f"# Index of {relative_dir}", ""]
-        base_url_part = f"{self.base_url}"
+    def _page_meta_changed(self, node):
+        """Return whether a title or description listed by the index of an
+        otherwise unchanged directory may have changed."""
+        if self.page_meta is None:
+            return False
+        return not all(
+            self.page_meta.is_current(os.path.join(node.path, name))
+            for name in node.files
+            if self._is_index_entry(name)
+        )
+
+    def _add_virtual_index_pages(self, files, config, base_folder, mirror=False):
+        """Add missing index pages to `files` without touching the disk.
+
+        With `mirror`, files of `base_folder` are added as virtual files backed
+        by their source path instead of being copied into docs_dir."""
+        tree = self.folder_trees[base_folder] = self._scan_tree(base_folder)
+        for node in tree.walk():
+            if self.manifest is not None:
+                self.manifest.seen.add(node.path)
+            prefix = "" if node.relpath == "." else node.relpath + "/"
+            if mirror:
+                for filename in node.files:
+                    src_uri = prefix + filename
+                    if src_uri in files or self._is_path_excluded(
+                        os.path.join(self.docs_dir, src_uri)
+                    ):
+                        continue
+                    files.append(
+                        File.generated(
+                            config,
+                            src_uri,
+                            abs_src_path=os.path.join(node.path, filename),
+                        )
+                    )
 
-        for item in sorted(os.listdir(dirpath)):
-            item_path = os.path.join(dirpath, item)
-            if os.path.isdir(item_path):
-                relative_item_path = os.path.join(relative_dir, item).replace("\\", "/")
-                content_lines.append(
-                    f"- [{item}]({base_url_part}/{relative_item_path}/)"
+            if "index.md" in node.files or prefix + "index.md" in files:
+                continue
+            is_home = node is tree and base_folder == self.docs_dir
+            if is_home and self.generate_home_index:
+                index_file = LazyFile.generated(config, "index.md", content="")
+                index_file._render = lambda: "\n".join(self._home_index_lines())
+                files.append(index_file)
+                self.logger.debug("Added virtual home index page")
+                continue
+            for page in range(1, self._index_page_count(node) + 1):
+                name = "index.md" if page == 1 else f"index-{page}.md"
+                index_file = LazyFile.generated(config, prefix + name, content="")
+                index_file._render = (
+                    lambda node=node, page=page: self._render_index_page(node, page)
                 )
-                # Recursively generate index.md
-                self._generate_index_page(docs_dir, item_path)
-            elif item.endswith(".md") and item != "index.md":
+                files.append(index_file)
+                self.logger.debug("Added virtual index page: %s", prefix + name)
+
+    def _is_path_excluded(self, path):
+        excluded = self.exclusion_matcher(path)
+        if excluded:
+            self.logger.debug("Excluding path=%s", path)
+        return excluded
+
+    def _is_index_entry(self, name):
+        if not name.endswith(".md") or name == "index.md":
+            return False
+        return not (self.index_page_size and INDEX_PAGE_RE.match(name))
+
+    def _index_entry_lines(self, node):
+        """Yield the index lines of a scanned directory's entries in name order."""
+        relative_dir = node.relpath
+        base_url_part = f"{self.base_url}"
+        entries = heapq.merge(
+            ((child.name, True) for child in node.dirs),
+            ((name, False) for name in node.files),
+        )
+        for item, is_dir in entries:
+            if is_dir:
+                relative_item_path = posixpath.join(relative_dir, item)
+                yield f"- [{item}]({base_url_part}/{relative_item_path}/)"
+            elif self._is_index_entry(item):
                 item_name = os.path.splitext(item)[0]
-                relative_item_path = os.path.join(relative_dir, item_name).replace(
-                    "\\", "/"
-                )
-                content_lines.append(
-                    f"- [{item_name}]({base_url_part}/{relative_item_path}/)"
-                )
+                relative_item_path = posixpath.join(relative_dir, item_name)
+                link = f"{base_url_part}/{relative_item_path}/"
+                if self.page_meta is None:
+                    yield f"- [{item_name}]({link})"
+                    continue
+                title, description = self._page_title(node, item)
+                title = re.sub(r"([\[\]])", r"\\\1", title)
+                if description:
+                    yield f"- [{title}]({link}) - {description}"
+                else:
+                    yield f"- [{title}]({link})"
+
+    def _page_title(self, node, name):
+        """Return the title and description listed for a Markdown file of a
+        scanned directory; the title falls back to the file name."""
+        stem = os.path.splitext(name)[0]
+        if self.page_meta is None:
+            return stem, None
+        title, description = self.page_meta.get(os.path.join(node.path, name))
+        return title or stem, description
+
+    def _home_trees(self):
+        folders = [self.docs_dir, *self.additional_index_folders]
+        return [self.folder_trees[f] for f in folders if f in self.folder_trees]
+
+    def _home_index_changed(self):
+        """Return whether a directory listed by the home index, or a page
+        title it shows, changed since the last build."""
+        return any(
+            node.changed or self._page_meta_changed(node)
+            for tree in self._home_trees()
+            for node in tree.walk()
+        )
 
-        content = "\n".join(content_lines)
-        index_path = os.path.join(dirpath, "index.md")
-        with open(index_path, "w") as f:
-            f.write(content)
+    def _write_home_index(self, changed=True):
+        """Write the home index to the root of docs_dir unless a hand-written
+        index.md is in the way, or the generated one is current because
+        nothing it lists `changed`."""
+        trees = self._home_trees()
+        root = trees[0]
+        if self.manifest is not None:
+            self.manifest.seen.add(root.path)
+        generated = self._is_generated(root)
+        if "index.md" in root.files and not generated:
+            return
+        if generated and not changed:
+            self.index_unchanged += 1
+            return
+        written, digest = write_lines_if_changed(
+            os.path.join(root.path, "index.md"), self._home_index_lines(trees)
+        )
+        self._record_index_page(
+            root, digest, ["index.md"], ["index.md"] if written else [], []
+        )
 
-        self.logger.info(f"Generated index page: {index_path}")
+    def _home_index_lines(self, trees=None):
+        """Yield the home index: a collapsible listing of docs_dir merged with
+        the additional folders, built from their scanned trees."""
+        if trees is None:
+            trees = self._home_trees()
+        yield "# Index of ."
+        yield ""
+        items = list(self._home_index_items(trees, self.home_index_depth))
+        if items:
+            yield '<ul class="breadcrumbs-home-index">'
+            yield from items
+            yield "</ul>"
 
-    def _copy_all_to_docs(self, base_folder, dirpath):
-        """Recursively copy all files and subdirectories from the base folder to
-        the corresponding docs directory."""
-        for root, dirs, files in os.walk(dirpath):
-            if self._is_path_excluded(root):
-                self.logger.debug(f"Skipping excluded path: {root}")
-                dirs[:] = []  # Don't traverse any subdirectories
+    def _home_index_items(self, nodes, depth):
+        """Yield the HTML list items of the entries of `nodes`, directories that
+        share one relpath, expanding subdirectories while `depth` allows it;
+        a depth of 0 is unlimited."""
+        children, files = {}, {}
+        for node in nodes:
+            for child in node.dirs:
+                children.setdefault(child.name, []).append(child)
+            for name in node.files:
+                files.setdefault(name, node)
+        relpath = nodes[0].relpath
+        entries = heapq.merge(
+            ((name, True) for name in sorted(children)),
+            ((name, False) for name in sorted(files)),
+        )
+        for name, is_dir in entries:
+            if not is_dir and not self._is_index_entry(name):
+                continue
+            source = name if relpath == "." else f"{relpath}/{name}"
+            if self._is_path_excluded(os.path.join(self.docs_dir, source)):
+                continue
+            # Pages link to their stem, directories to themselves
+            path = source if is_dir else os.path.splitext(source)[0]
+            url = html.escape(f"{self.base_url}/{path}/")
+            if not is_dir:
+                title, description = self._page_title(files[name], name)
+                item = f'<li><a href="{url}">{html.escape(title)}</a>'
+                if description:
+                    item += f" - {html.escape(description)}"
+                yield item + "</li>"
                 continue
+            link = f'<a href="{url}">{html.escape(name)}</a>'
+            scanned = [child for child in children[name] if child.scanned]
+            items = []
+            if scanned and depth != 1:
+                items = list(self._home_index_items(scanned, max(depth - 1, 0)))
+            if not items:
+                yield f"<li>{link}</li>"
+                continue
+            yield f"<li><details><summary>{link}</summary>"
+            yield "<ul>"
+            yield from items
+            yield "</ul>"
+            yield "</details></li>"
 
-            relative_path = os.path.relpath(root, base_folder)
-            dest_dir = os.path.join(self.docs_dir, relative_path)
-            self.logger.debug(f"Copying files from {root} to {dest_dir}")
+    def _index_page_count(self, node):
+        if not self.index_page_size:
+            return 1
+        count = len(node.dirs) + sum(map(self._is_index_entry, node.files))
+        return max(1, -(-count // self.index_page_size))
 
-            if not os.path.exists(dest_dir):
-                os.makedirs(dest_dir)
+    def _index_page_url(self, node, page):
+        parts = [] if node.relpath == "." else [node.relpath]
+        if page > 1:
+            parts.append(f"index-{page}")
+        return f"{self.base_url}/" + "".join(f"{part}/" for part in parts)
 
-            for file in files:
-                src_file_path = os.path.join(root, file)
+    def _index_page_lines(self, node, page, pages, entries):
+        """Yield the lines of one index page, taking its entries from `entries`."""
+        if pages == 1:
+            yield f"# Index of {node.relpath}"
+            yield ""
+            yield from entries
+            return
+        yield f"# Index of {node.relpath} ({page}/{pages})"
+        yield ""
+        yield from islice(entries, self.index_page_size)
+        links = []
+        if page > 1:
+            links.append(f"[Previous]({self._index_page_url(node, page - 1)})")
+        if page < pages:
+            links.append(f"[Next]({self._index_page_url(node, page + 1)})")
+        yield ""
+        yield " | ".join(links)
+
+    def _render_index_page(self, node, page=1):
+        """Return the index Markdown listing the entries of a scanned directory."""
+        pages = self._index_page_count(node)
+        entries = self._index_entry_lines(node)
+        if page > 1:
+            entries = islice(entries, (page - 1) * self.index_page_size, None)
+        return "\n".join(self._index_page_lines(node, page, pages, entries))
+
+    def _write_index_page(self, node):
+        """Stream the index pages of `node` to disk; safe to run on a worker.
+
+        Return the digest of index.md, the names of all pages, the names of
+        the pages actually written and the names of stale pages removed."""
+        pages = self._index_page_count(node)
+        entries = self._index_entry_lines(node)
+        names, written_names, digest = [], [], None
+        for page in range(1, pages + 1):
+            name = "index.md" if page == 1 else f"index-{page}.md"
+            lines = self._index_page_lines(node, page, pages, entries)
+            written, page_digest = write_lines_if_changed(
+                os.path.join(node.path, name), lines
+            )
+            digest = digest or page_digest
+            names.append(name)
+            if written:
+                written_names.append(name)
+        removed = []
+        for name in node.files:
+            match = INDEX_PAGE_RE.match(name)
+            if match and int(match.group(1)) > pages:
+                if self._remove_generated_page(node, name):
+                    removed.append(name)
+        return digest, names, written_names, removed
+
+    def _remove_generated_page(self, node, name):
+        """Remove a stale paginated index page if it is one we generated."""
+        path = os.path.join(node.path, name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                if not f.readline().startswith(f"# Index of {node.relpath} ("):
+                    return False
+            os.remove(path)
+        except (OSError, ValueError):
+            return False
+        return True
+
+    def _record_index_page(self, node, digest, names, written_names, removed):
+        existed = set(node.files)
+        for name in names:
+            if name not in node.files:
+                bisect.insort(node.files, name)
+        for name in removed:
+            node.files.remove(name)
+        self.generated_indexes[node.path] = digest
+        if self.docs_written is not None and self._docs_src_uri(node.path):
+            self.docs_written.extend(os.path.join(node.path, name) for name in names)
+            self.docs_removed.extend(os.path.join(node.path, name) for name in removed)
+        self.index_unchanged += len(names) - len(written_names)
+        if not written_names and not removed:
+            self.logger.debug("Index page unchanged: %s", node.path)
+            return
+        self.index_written += len(written_names)
+        if self.manifest is not None:
+            # Our own write changed the directory; keep the listing current.
+            listing = self.manifest.listings.get(node.path)
+            if listing is not None:
+                listing["mtime"] = os.stat(node.path).st_mtime_ns
+
+        for name in written_names:
+            index_path = os.path.join(node.path, name)
+            if self.ledger is not None:
+                self.ledger.add(index_path, existed=name in existed)
+            self.logger.log(self.detail_level, "Generated index page: %s", index_path)
+
+    def _copy_all_to_docs(self, nodes):
+        """Mirror the files of scanned directories from the base folder to the
+        corresponding docs directories, syncing files on the worker pool."""
+        pairs = []
+        for node in nodes:
+            dest_dir = os.path.join(self.docs_dir, node.relpath)
+            self.logger.debug("Mirroring files from %s to %s", node.path, dest_dir)
+            if not os.path.isdir(dest_dir):
+                os.makedirs(dest_dir, exist_ok=True)
+                if self.ledger is not None:
+                    self.ledger.add_dir(dest_dir)
+            for file in node.files:
                 dest_file_path = os.path.join(dest_dir, file)
                 if self._is_path_excluded(dest_file_path):
-                    self.logger.debug(f"Skipping excluded file: {dest_file_path}")
+                    self.logger.debug("Skipping excluded file: %s", dest_file_path)
                     continue
-                if os.path.exists(dest_file_path):
-                    self.logger.debug(
-                        f"Skipping already present file: {dest_file_path}"
-                    )
+                pairs.append((os.path.join(node.path, file), dest_file_path))
+        actions = self._map(self._mirror_file, pairs)
+        if self.docs_written is not None:
+            self.docs_written.extend(
+                dest for (_, dest), action in zip(pairs, actions) if action != "kept"
+            )
+
+    def _mirror_file(self, paths):
+        src_file_path, dest_file_path = paths
+        existed = os.path.lexists(dest_file_path)
+        action = self.mirror.sync(src_file_path, dest_file_path)
+        if self.ledger is not None and action in ("copied", "linked"):
+            self.ledger.add(dest_file_path, existed=existed)
+        self.logger.debug(
+            "Mirrored %s to %s: %s", src_file_path, dest_file_path, action
+        )
+        return action
+
+    def _sweep_artifacts(self, reason):
+        """Remove the files and directories recorded in the ledger."""
+        removed, kept = self.ledger.sweep()
+        self.ledger.save()
+        if removed or kept:
+            self.logger.info(
+                "Removed %d %s generated files, kept %d changed since they were written",
+                removed,
+                reason,
+                kept,
+            )
+
+    def on_post_build(self, config, **kwargs):
+        if self.site_breadcrumbs is not None:
+            path = os.path.join(config["site_dir"], self.config["breadcrumbs_json"])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = json.dumps(self.site_breadcrumbs, separators=(",", ":"))
+            atomic_write(path, data.encode("utf-8"))
+            self.logger.info(
+                "Wrote breadcrumbs of %d pages to %s", len(self.site_breadcrumbs), path
+            )
+        # `mkdocs serve` keeps its artifacts until on_shutdown
+        if self.ledger is not None and self.command != "serve":
+            self._sweep_artifacts("built")
+        if self.page_meta is not None:
+            self.page_meta.save()
+        if self.breadcrumb_cache is not None:
+            self.breadcrumb_cache.save()
+        if self.log_summary:
+            self.logger.info(
+                "Breadcrumbs for %d pages, %d index pages written, %d unchanged",
+                self.page_count,
+                self.index_written,
+                self.index_unchanged,
+            )
+        if self.profiler is not None:
+            self.profiler.count("pages", self.page_count)
+            self.profiler.count("index_pages_written", self.index_written)
+            self.profiler.count("index_pages_unchanged", self.index_unchanged)
+            self.profiler.count("exclusion_cache_hits", self.exclusion_matcher.hits)
+            self.profiler.count(
+                "exclusion_cache_misses", len(self.exclusion_matcher.cache)
+            )
+            self.logger.info("Profile:\n%s", self.profiler.report())
+            if self.config["profile_json"]:
+                path = self._resolve_path(config, self.config["profile_json"])
+                self.profiler.write_json(path)
+                self.logger.info("Profile written to %s", path)
+
+    def on_shutdown(self):
+        for handler in self.watch_handlers:
+            handler.cancel()
+        if self.ledger is not None:
+            self._sweep_artifacts("built")
+
+    def on_serve(self, server, config, builder, **kwargs):
+        """Keep additional folders in sync while serving.
+
+        Written index pages and mirrored files land in docs_dir, which the
+        server already watches, so a change reloads like any docs page. In
+        virtual mode the folders are simply watched for a rebuild."""
+        if self.virtual_index_pages:
+            for folder in self.additional_index_folders:
+                server.watch(folder)
+            return server
+        from .watcher import DebouncedHandler
+
+        handlers = []
+        for folder in self.additional_index_folders:
+            handler = DebouncedHandler(
+                lambda events, folder=folder: self._on_folder_events(folder, events),
+                self.config["watch_debounce"],
+            )
+            server.observer.schedule(handler, os.path.abspath(folder), recursive=True)
+            handlers.append(handler)
+            self.logger.info("Watching additional folder=%s", folder)
+        self.watch_handlers = handlers
+        self.watched_folders = tuple(self.additional_index_folders)
+        return server
+
+    def _on_folder_events(self, folder, events):
+        """Regenerate the index pages and mirrored files of the directories of
+        `folder` touched by a batch of events."""
+        # Directory -> whether its whole subtree is new and must be scanned
+        directories = {}
+        # Files and directories gone from the folder, whose copies must go
+        gone = []
+        for event in events:
+            if event.is_directory and event.event_type == "modified":
+                continue
+            paths = [event.src_path]
+            if event.event_type == "moved":
+                paths.append(event.dest_path)
+            if event.event_type in ("deleted", "moved"):
+                gone.append(event.src_path)
+            for path in paths:
+                directories.setdefault(os.path.dirname(path), False)
+            if event.is_directory and event.event_type in ("created", "moved"):
+                directories[paths[-1]] = True
+        root = os.path.abspath(folder)
+        nodes = {}
+        rescanned = []
+        for directory, recursive in sorted(directories.items()):
+            relpath = os.path.relpath(directory, root)
+            if relpath.startswith(os.pardir) or not os.path.isdir(directory):
+                continue
+            path = os.path.join(folder, relpath) if relpath != "." else folder
+            if self._is_path_excluded(path):
+                continue
+            relpath = relpath.replace(os.sep, "/")
+            try:
+                if recursive:
+                    tree = scan_tree(path, self._is_path_excluded, relpath=relpath)
+                    nodes.update((node.path, node) for node in tree.walk())
+                elif path not in nodes:
+                    tree = nodes[path] = scan_directory(path, relpath)
                 else:
-                    shutil.copy(src_file_path, dest_file_path)
-                    self.logger.debug(f"Copied {src_file_path} to {dest_file_path}")
-
-    def _cleanup_folder(self, folder):
-        """Recursively delete a folder and its contents."""
-        for root, dirs, files in os.walk(folder, topdown=False):
-            for name in files:
-                os.remove(os.path.join(root, name))
-                self.logger.debug(f"Deleted file {os.path.join(root, name)}")
-            for name in dirs:
-                os.rmdir(os.path.join(root, name))
-                self.logger.debug(f"Deleted directory {os.path.join(root, name)}")
+                    continue
+            except OSError:
+                continue
+            rescanned.append((tree, recursive))
+        if not nodes and not gone:
+            return
+        with self._regenerate_lock:
+            folder_tree = self.folder_trees.get(folder)
+            # Only a listing or, with rich_index, a title can change the home index
+            home_changed = folder_tree is None or any(
+                map(self._page_meta_changed, nodes.values())
+            )
+            if folder_tree is not None:
+                for tree, recursive in rescanned:
+                    if self._graft(folder_tree, tree, recursive):
+                        home_changed = True
+            self.mirror = Mirror(self.config["mirror_mode"], self.mirror_owned)
+            self._remove_mirrored(root, gone)
+            self._update_nodes([nodes[path] for path in sorted(nodes)], True)
+            if self.generate_home_index and self.docs_dir in self.folder_trees:
+                self._write_home_index(home_changed)
+            save_owned(self.mirror_state, self.mirror_owned)
+            if self.ledger is not None:
+                self.ledger.save()
+            if self.manifest is not None:
+                self.manifest.keep(folder)
+                self.manifest.save()
+        self.logger.info(
+            "Regenerated %d directories of folder=%s: %s",
+            len(nodes),
+            folder,
+            self.mirror.stats,
+        )
+
+    def _remove_mirrored(self, root, paths):
+        """Remove the docs_dir copies of the files and directories at `paths`
+        that left the additional folder at `root`.
+
+        Only copies the mirror placed and nobody touched since are removed."""
+        for path in paths:
+            relpath = os.path.relpath(path, root)
+            if relpath.startswith(os.pardir) or os.path.lexists(path):
+                continue
+            dest = os.path.normpath(os.path.join(self.docs_dir, relpath))
+            prefix = os.path.join(dest, "")
+            for owned in list(self.mirror_owned):
+                normalized = os.path.normpath(owned)
+                if normalized != dest and not normalized.startswith(prefix):
+                    continue
+                if self.mirror.remove(owned):
+                    self.logger.debug("Removed mirrored file: %s", owned)
+                    if self.ledger is not None:
+                        self.ledger.discard(owned)
+
+    def _graft(self, tree, node, recursive):
+        """Replace the directory of `tree` at the relpath of a rescanned `node`
+        and return whether its listing changed.
+
+        Subdirectories of a `node` listed on its own keep their scanned
+        subtrees from `tree`."""
+        target = tree
+        for part in [] if node.relpath == "." else node.relpath.split("/"):
+            target = next((child for child in target.dirs if child.name == part), None)
+            if target is None:
+                return True
+        changed = recursive or target.files != node.files
+        if not recursive:
+            previous = {child.name: child for child in target.dirs}
+            changed = changed or list(previous) != [child.name for child in node.dirs]
+            node.dirs = [previous.get(child.name, child) for child in node.dirs]
+        target.files = node.files
+        target.dirs = node.dirs
+        target.scanned = True
+        return changed
 
     def on_page_markdown(self, markdown, page, config, files, **kwargs):
-        home_breadcrumb = (
-            f"[{self.config['home_text']}]({self.base_url}/)"
-            if self.base_url
-            else f"[{self.config['home_text']}](/)"
+        with self._timed("on_page_markdown"):
+            self.page_count += 1
+            if self.output != "markdown":
+                return markdown
+            home_breadcrumb = (
+                f"[{self.config['home_text']}]({self.base_url}/)"
+                if self.base_url
+                else f"[{self.config['home_text']}](/)"
+            )
+
+            # For homepage, only include the home link without additional breadcrumbs
+            if getattr(page, "is_homepage", False):
+                breadcrumb_str = home_breadcrumb
+            else:
+                # For other pages, generate and include additional breadcrumbs
+                breadcrumbs = self._generate_breadcrumbs(page)
+                breadcrumb_str = home_breadcrumb + (
+                    self.config["delimiter"] + breadcrumbs if breadcrumbs else ""
+                )
+
+            self.logger.log(
+                self.detail_level, "Generated breadcrumb string: %s", breadcrumb_str
+            )
+            return breadcrumb_str + "\n" + markdown
+
+    def on_page_context(self, context, page, config, nav, **kwargs):
+        if self.output != "markdown":
+            with self._timed("on_page_context"):
+                items = self._breadcrumb_items(page)
+                context["breadcrumbs"] = [
+                    {"title": title, "url": url} for title, url in items
+                ]
+                context["breadcrumbs_html"] = self._render_breadcrumbs_html(items)
+        return context
+
+    def on_post_page(self, output, page, config, **kwargs):
+        if self.output != "html" and not self.json_ld and self.site_breadcrumbs is None:
+            return output
+        with self._timed("on_post_page"):
+            items = self._breadcrumb_items(page)
+            if self.site_breadcrumbs is not None:
+                self.site_breadcrumbs[page.url] = [
+                    {"title": title, "url": url} for title, url in items
+                ]
+            if self.output == "html":
+                breadcrumb_html = self._render_breadcrumbs_html(items)
+                self.logger.log(
+                    self.detail_level, "Generated breadcrumb HTML: %s", breadcrumb_html
+                )
+                output = self._insert_html(output, breadcrumb_html)
+            if self.json_ld:
+                position = output.find("</head>")
+                if position != -1:
+                    script = self._render_json_ld(items, config.get("site_url") or "")
+                    output = output[:position] + script + output[position:]
+            return output
+
+    def _insert_html(self, output, fragment):
+        for anchor in HTML_ANCHORS:
+            match = anchor.search(output)
+            if match is not None:
+                position = match.end()
+                return output[:position] + fragment + output[position:]
+        return output
+
+    def _render_json_ld(self, items, site_url):
+        """Return a schema.org BreadcrumbList script for the given crumbs."""
+        elements = []
+        for position, (title, url) in enumerate(items, start=1):
+            element = {"@type": "ListItem", "position": position, "name": title}
+            if url is not None:
+                element["item"] = urljoin(site_url, url) if site_url else url
+            elements.append(element)
+        data = json.dumps(
+            {
+                "@context": "https://schema.org",
+                "@type": "BreadcrumbList",
+                "itemListElement": elements,
+            },
+            separators=(",", ":"),
         )
+        # Keep a title containing "</script>" from closing the element early
+        data = data.replace("</", "<\\/")
+        return f'<script type="application/ld+json">{data}</script>'
 
-        # For homepage, only include the home link without additional breadcrumbs
+    def _breadcrumb_items(self, page):
+        """Return the (title, url) pairs of a page's breadcrumbs, starting with
+        the home link; sections without a page have no url."""
+        items = [(self.config["home_text"], f"{self.base_url}/")]
         if getattr(page, "is_homepage", False):
-            breadcrumb_str = home_breadcrumb
-        else:
-            # For other pages, generate and include additional breadcrumbs
-            breadcrumbs = self._generate_breadcrumbs(page)
-            breadcrumb_str = home_breadcrumb + (
-                self.config["delimiter"] + self.config["delimiter"].join(breadcrumbs)
-                if breadcrumbs
-                else ""
-            )
+            return items
+        if self.breadcrumb_cache is not None:
+            return items + self._cached_crumbs(page)
+        return items + self._page_crumbs(page)
+
+    def _page_crumbs(self, page):
+        """Return the (title, url) crumbs of a page below the home link."""
+        if self.config["use_page_titles"]:
+            return self._generate_breadcrumb_items_from_page_titles(page)
+        node = self._get_crumb_trie().lookup(page.url)
+        return [(crumb.title, crumb.url) for crumb in node.chain()]
 
-        self.logger.info(f"Generated breadcrumb string: {breadcrumb_str}")
-        return breadcrumb_str + "\n" + markdown
+    def _cached_crumbs(self, page):
+        return self.breadcrumb_cache.get(page.url, lambda: self._page_crumbs(page))
+
+    def _render_breadcrumbs_html(self, items):
+        delimiter = html.escape(self.config["delimiter"])
+        crumbs = [
+            (
+                f'<a href="{html.escape(url)}">{html.escape(title)}</a>'
+                if url is not None
+                else f"<span>{html.escape(title)}</span>"
+            )
+            for title, url in items
+        ]
+        return (
+            f'<nav class="breadcrumbs" aria-label="Breadcrumbs">'
+            f"{delimiter.join(crumbs)}</nav>"
+        )
 
     def _generate_breadcrumbs(self, page):
+        if self.breadcrumb_cache is not None:
+            crumbs = self._cached_crumbs(page)
+            return self.config["delimiter"].join(map(self._format_crumb, crumbs))
         if self.config["use_page_titles"]:
             return self._generate_breadcrumbs_from_page_titles(page)
         return self._generate_breadcrumbs_from_url(page)
 
-    def _generate_breadcrumbs_from_page_titles(self, page):
-        breadcrumbs = []
-        accumulated_path = []
+    def _join_crumbs(self, trail, crumb):
+        if not crumb:
+            return trail
+        return trail + self.config["delimiter"] + crumb if trail else crumb
+
+    def _format_crumb(self, crumb):
+        title, url = crumb
+        return title if url is None else f"[{title}]({url})"
+
+    def _title_crumb(self, item):
+        """Return the (title, url) crumb of a nav item, or None."""
+        if item.is_page:
+            crumb_url = (
+                f"{self.base_url}/{item.url}" if self.base_url else f"/{item.url}"
+            )
+            return item.title, crumb_url
+        if item.is_section:
+            return item.title, None
+        return None
+
+    def _nav_node(self, item):
+        """Return the NavNode of a nav item, recording it and any missing
+        ancestors first so each section is rendered once per build."""
+        nodes = self.nav_index.nodes
+        pending = []
+        node = None
+        while item and getattr(item, "is_homepage", False) is False:
+            if id(item) in nodes:
+                node = nodes[id(item)]
+                break
+            pending.append(item)
+            item = item.parent
+        for item in reversed(pending):
+            node = self.nav_index.add(item, node, self._title_crumb(item))
+        return node
+
+    def _page_nav_node(self, page):
+        """Return the NavNode of a page's parent, or None at the top level."""
+        try:
+            return self.nav_index.pages[page.url]
+        except KeyError:
+            return self._nav_node(page.parent)
 
-        current_page = page
-        while current_page and getattr(current_page, "is_homepage", False) is False:
-            accumulated_path.insert(0, current_page)
-            current_page = current_page.parent
+    def _page_title_tail(self, page):
+        """Return the crumb a page adds after its ancestors, or None."""
+        if page.is_page or not page.is_section:
+            return None
+        return page.title, None
 
-        if not accumulated_path:
+    def _generate_breadcrumbs_from_page_titles(self, page):
+        if not page or getattr(page, "is_homepage", False) is not False:
+            return ""
+        node = self._page_nav_node(page)
+        trail = node.trail if node is not None else ""
+        tail = self._page_title_tail(page)
+        if tail is None:
+            return trail
+        return self._join_crumbs(trail, self._format_crumb(tail))
+
+    def _generate_breadcrumb_items_from_page_titles(self, page):
+        if not page or getattr(page, "is_homepage", False) is not False:
             return []
+        node = self._page_nav_node(page)
+        crumbs = node.crumbs() if node is not None else []
+        tail = self._page_title_tail(page)
+        if tail is not None:
+            crumbs.append(tail)
+        return crumbs
+
+    def on_nav(self, nav, config, files, **kwargs):
+        if self.config["use_page_titles"] and self.breadcrumb_cache is not None:
+            # Cached crumbs make the nav index unnecessary; pages missing from
+            # the cache record their sections on demand
+            if self.breadcrumb_cache.load(self._breadcrumb_key(nav)):
+                return nav
+        if self.config["use_page_titles"]:
+            # Record every section once; pages only point at their parent
+            pages = self.nav_index.pages
+            stack = [(item, None) for item in nav.items]
+            while stack:
+                item, parent = stack.pop()
+                if item.is_page and not item.is_homepage:
+                    pages[item.url] = parent
+                children = getattr(item, "children", None)
+                if children:
+                    node = self.nav_index.add(item, parent, self._title_crumb(item))
+                    stack.extend((child, node) for child in children)
+        return nav
 
-        for i, part_page in enumerate(accumulated_path):
-            is_last = i == len(accumulated_path) - 1
-            if is_last and part_page.is_page:
+    def _breadcrumb_key(self, nav=None):
+        """Return the hash of everything that shapes cached crumbs: the
+        settings and, for title breadcrumbs, the sections and pages of `nav`."""
+        parts = [repr((self.base_url, self.config["use_page_titles"]))]
+        stack = list(reversed(nav.items)) if nav is not None else []
+        while stack:
+            item = stack.pop()
+            if item.is_page:
+                parts.append(f"p\0{item.url}\0{item.is_homepage}")
                 continue
-            if part_page.is_page:
-                crumb_url = (
-                    f"{self.base_url}/{part_page.url}"
-                    if self.base_url
-                    else f"/{part_page.url}"
-                )
-                breadcrumbs.append(f"[{part_page.title}]({crumb_url})")
-            elif part_page.is_section:
-                breadcrumbs.append(part_page.title)
-        return breadcrumbs
+            children = getattr(item, "children", None) or []
+            parts.append(f"s\0{item.title}\0{item.is_section}\0{len(children)}")
+            stack.extend(reversed(children))
+        return content_hash("\n".join(parts))
 
-    def _generate_breadcrumbs_from_url(self, page):
-        breadcrumbs = []
-        accumulated_path = []
+    def _get_crumb_trie(self):
+        if self.crumb_trie is None or self.crumb_trie.base_url != self.base_url:
+            self.crumb_trie = CrumbTrie(self.base_url, self.config["delimiter"])
+        return self.crumb_trie
 
-        path_parts = page.url.strip("/").split("/")
-        for part in path_parts:
-            accumulated_path.append(part)
-            current_path = "/".join(accumulated_path)
-            crumb_url = (
-                f"{self.base_url}/{current_path}"
-                if self.base_url
-                else f"/{current_path}"
-            )
-            title = unquote(part)
-            breadcrumbs.append(f"[{title}]({crumb_url})")
-            self.logger.debug(f"Added breadcrumb: {title} with URL: {crumb_url}")
-        return breadcrumbs
+    def _generate_breadcrumbs_from_url(self, page):
+        return self._get_crumb_trie().lookup(page.url).trail
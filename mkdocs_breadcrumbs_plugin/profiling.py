@@ -0,0 +1,77 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from .utils import atomic_write
+
+
+class Profiler:
+    """Wall-clock timings, call counts and counters collected during a build.
+
+    Recording is thread-safe, so wrapped functions may run on worker threads."""
+
+    def __init__(self):
+        self.timings = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self._lock:
+            entry = self.timings.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += seconds
+
+    @contextmanager
+    def timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def wrap(self, name, func):
+        """Return `func` recording its calls under `name`."""
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+
+        return wrapper
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def as_dict(self):
+        return {
+            "timings": {
+                name: {"calls": calls, "seconds": seconds}
+                for name, (calls, seconds) in self.timings.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def report(self):
+        """Return the timings and counters as a plain-text table."""
+        width = max(len(name) for name in ["Counter", *self.timings, *self.counters])
+        lines = [f"{'Step':<{width}}  {'calls':>8}  {'total ms':>10}  {'mean ms':>9}"]
+        for name, (calls, seconds) in self.timings.items():
+            lines.append(
+                f"{name:<{width}}  {calls:>8}  {seconds * 1000:>10.2f}  "
+                f"{seconds * 1000 / calls:>9.3f}"
+            )
+        if self.counters:
+            lines.append(f"{'Counter':<{width}}  {'value':>8}")
+            for name, value in self.counters.items():
+                lines.append(f"{name:<{width}}  {value:>8}")
+        return "\n".join(lines)
+
+    def write_json(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        data = json.dumps(self.as_dict(), indent=2, sort_keys=True)
+        atomic_write(path, data.encode("utf-8"))
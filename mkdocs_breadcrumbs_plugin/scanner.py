@@ -0,0 +1,117 @@
+import os
+
+
+class DirNode:
+    """A directory of a scanned tree with its subdirectories and file names."""
+
+    __slots__ = ("name", "path", "relpath", "dirs", "files", "scanned", "changed")
+
+    def __init__(self, name, path, relpath):
+        self.name = name
+        self.path = path
+        self.relpath = relpath
+        self.dirs = []
+        self.files = []
+        self.scanned = False
+        self.changed = True
+
+    def walk(self):
+        """Yield this node and every scanned descendant, parents first."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if not node.scanned:
+                continue
+            yield node
+            stack.extend(reversed(node.dirs))
+
+
+def list_directory(path):
+    """List `path` once and return its sorted subdirectories, symlinked
+    subdirectories and file names."""
+    dirs, links, files = [], [], []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                (links if entry.is_symlink() else dirs).append(entry.name)
+            else:
+                files.append(entry.name)
+    return {"dirs": sorted(dirs), "links": sorted(links), "files": sorted(files)}
+
+
+def _read_listing(path, previous, track_mtime):
+    """Return the listing of `path` and whether it differs from `previous`."""
+    try:
+        if track_mtime:
+            mtime = os.stat(path).st_mtime_ns
+            if previous is not None and previous["mtime"] == mtime:
+                return previous, False
+        listing = list_directory(path)
+    except OSError:
+        return None, True
+    if track_mtime:
+        listing["mtime"] = mtime
+    return listing, True
+
+
+def _child(node, name):
+    relpath = name if node.relpath == "." else f"{node.relpath}/{name}"
+    return DirNode(name, os.path.join(node.path, name), relpath)
+
+
+def scan_directory(path, relpath="."):
+    """List `path` on its own and return its DirNode; subdirectories are
+    recorded but not scanned."""
+    node = DirNode(os.path.basename(path), path, relpath)
+    listing = list_directory(path)
+    node.scanned = True
+    node.files = listing["files"]
+    node.dirs = [
+        _child(node, name) for name in sorted(listing["dirs"] + listing["links"])
+    ]
+    return node
+
+
+def scan_tree(root, is_excluded=None, listings=None, executor=None, relpath="."):
+    """Scan `root` with os.scandir and return its DirNode tree.
+
+    Every directory is listed exactly once and entry types come from the scan
+    itself. Directories for which `is_excluded(path)` is true, and symlinked
+    directories, are recorded in their parent but not entered.
+
+    With a `listings` dict, a directory whose mtime matches its entry there is
+    not listed again and its node is marked unchanged; new listings are stored
+    back into the dict. With an `executor`, the directories of each tree level
+    are listed concurrently; the resulting tree is the same. `relpath` is the
+    path of `root` relative to the folder the tree belongs to."""
+    tree = DirNode(os.path.basename(root), root, relpath)
+    track_mtime = listings is not None
+    level = [tree]
+    while level:
+        if is_excluded is not None:
+            level = [node for node in level if not is_excluded(node.path)]
+        paths = [node.path for node in level]
+        if track_mtime:
+            previous = [listings.get(path) for path in paths]
+        else:
+            previous = [None] * len(paths)
+        results = (executor.map if executor is not None else map)(
+            _read_listing, paths, previous, [track_mtime] * len(paths)
+        )
+        next_level = []
+        for node, (listing, changed) in zip(level, results):
+            if listing is None:
+                continue
+            node.scanned = True
+            node.changed = changed
+            if changed and track_mtime:
+                listings[node.path] = listing
+            node.files = listing["files"]
+            links = listing["links"]
+            for name in sorted(listing["dirs"] + links):
+                child = _child(node, name)
+                node.dirs.append(child)
+                if name not in links:
+                    next_level.append(child)
+        level = next_level
+    return tree
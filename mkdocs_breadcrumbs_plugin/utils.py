@@ -0,0 +1,97 @@
+import hashlib
+import os
+import tempfile
+
+# Read once so atomically written files get the same mode as open(path, "w").
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def _open_temp(path):
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp"
+    )
+    return os.fdopen(fd, "wb"), tmp_path
+
+
+def _discard(f, tmp_path):
+    f.close()
+    try:
+        os.remove(tmp_path)
+    except OSError:
+        pass
+
+
+def atomic_write(path, data):
+    """Write `data` bytes to `path` through a temporary file and a rename, so
+    readers never see a partially written file."""
+    f, tmp_path = _open_temp(path)
+    try:
+        with f:
+            f.write(data)
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _discard(f, tmp_path)
+        raise
+
+
+def write_lines_if_changed(path, lines):
+    """Stream `lines`, joined by newlines, to `path` unless the file already
+    holds exactly these bytes. Return whether the file was written and the
+    SHA-256 hex digest of the content.
+
+    The new content is compared against the file while it is produced and is
+    only written to a temporary file from the first difference on, so memory
+    stays bounded by the longest line."""
+    digest = hashlib.sha256()
+    try:
+        existing = open(path, "rb")
+    except OSError:
+        existing = None
+    out = tmp_path = None
+    matched = 0
+    try:
+        separator = b""
+        for line in lines:
+            data = separator + line.encode("utf-8")
+            separator = b"\n"
+            digest.update(data)
+            if out is None:
+                if existing is not None and existing.read(len(data)) == data:
+                    matched += len(data)
+                    continue
+                out, tmp_path = _open_temp(path)
+                _copy_prefix(existing, out, matched)
+            out.write(data)
+        if out is None:
+            if existing is not None and not existing.read(1):
+                return False, digest.hexdigest()
+            out, tmp_path = _open_temp(path)
+            _copy_prefix(existing, out, matched)
+        out.close()
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+        return True, digest.hexdigest()
+    except BaseException:
+        if out is not None:
+            _discard(out, tmp_path)
+        raise
+    finally:
+        if existing is not None:
+            existing.close()
+
+
+def _copy_prefix(existing, out, length):
+    """Copy the first `length` bytes of `existing`, known to match the new
+    content, to `out`."""
+    if not length:
+        return
+    existing.seek(0)
+    while length:
+        chunk = existing.read(min(length, _CHUNK_SIZE))
+        out.write(chunk)
+        length -= len(chunk)
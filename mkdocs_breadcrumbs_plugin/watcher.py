@@ -0,0 +1,50 @@
+import threading
+
+from watchdog.events import FileSystemEventHandler
+
+# Event types that can change a directory listing or a file's content
+_CHANGE_EVENTS = ("created", "deleted", "modified", "moved")
+
+
+class DebouncedHandler(FileSystemEventHandler):
+    """Collect file system events and pass them to `callback` in batches.
+
+    A batch is handed over once no new event arrived for `delay` seconds, so
+    a burst of writes, e.g. a checkout or a save with a swap file, results in
+    a single call. The callback runs on a timer thread."""
+
+    def __init__(self, callback, delay):
+        super().__init__()
+        self.callback = callback
+        self.delay = delay
+        self.events = []
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def on_any_event(self, event):
+        if event.event_type not in _CHANGE_EVENTS:
+            return
+        with self._lock:
+            self.events.append(event)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        """Pass the pending events to the callback right away."""
+        with self._lock:
+            events, self.events = self.events, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if events:
+            self.callback(events)
+
+    def cancel(self):
+        with self._lock:
+            self.events = []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
@@ -0,0 +1,45 @@
+from mkdocs_breadcrumbs_plugin.breadcrumbs import CrumbTrie, NavIndex
+import unittest
+
+
+class TestCrumbTrie(unittest.TestCase):
+    def test_lookup_renders_trail(self):
+        """Test that a page's trail holds a crumb per URL segment."""
+        trie = CrumbTrie("/docs", " / ")
+        node = trie.lookup("parent/my%20child/page/")
+        self.assertEqual(
+            node.trail,
+            "[parent](/docs/parent) / [my child](/docs/parent/my%20child)"
+            " / [page](/docs/parent/my%20child/page)",
+        )
+        self.assertEqual(
+            [n.title for n in node.chain()], ["parent", "my child", "page"]
+        )
+
+    def test_siblings_share_prefix_nodes(self):
+        """Test that common URL prefixes are inserted only once."""
+        trie = CrumbTrie("", " / ")
+        first = trie.lookup("a/b/one/")
+        second = trie.lookup("a/b/two/")
+        self.assertIs(first.parent, second.parent)
+        self.assertEqual(list(trie.root.children), ["a"])
+        self.assertIs(trie.lookup("a/b/one/"), first)
+
+
+class TestNavIndex(unittest.TestCase):
+    def test_nodes_share_their_parent_trail(self):
+        """Test that a node's trail extends the trail of its parent."""
+        index = NavIndex(" / ")
+        items = [object() for _ in range(3)]
+        guide = index.add(items[0], None, ("Guide", None))
+        setup = index.add(items[1], guide, ("Setup", "/guide/setup/"))
+        self.assertIs(index.add(items[2], setup, None), setup)
+        self.assertEqual(setup.trail, "Guide / [Setup](/guide/setup/)")
+        self.assertEqual(setup.crumbs(), [("Guide", None), ("Setup", "/guide/setup/")])
+        self.assertEqual(
+            [index.nodes[id(item)] for item in items], [guide, setup, setup]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+from mkdocs_breadcrumbs_plugin.exclusion import ExclusionMatcher
+import fnmatch
+import unittest
+
+
+class TestExclusionMatcher(unittest.TestCase):
+    def test_matches_like_fnmatch(self):
+        """Test that plain patterns keep fnmatch semantics."""
+        patterns = ["mkdocs/**", "index.md", "*.tmp", "drafts/?.md", "[ab]*/x"]
+        matcher = ExclusionMatcher(["docs/" + p for p in patterns], "/docs")
+        paths = [
+            "mkdocs",
+            "mkdocs/a",
+            "mkdocs/a/b.md",
+            "index.md",
+            "sub/index.md",
+            "a/b.tmp",
+            "drafts/1.md",
+            "drafts/10.md",
+            "a/x",
+            "c/x",
+        ]
+        for path in paths:
+            expected = any(fnmatch.fnmatchcase(path, p) for p in patterns)
+            self.assertEqual(matcher.match_relative(path), expected, path)
+
+    def test_bracket_sets_match_like_fnmatch(self):
+        """Test that `]` right after `[` or `[!` belongs to the set."""
+        patterns = ["[!]x]", "*[!]x]", "[]x]y", "[!x]", "[z-a]*", "[a-c-]", "[^a]"]
+        paths = ["]", "x", "a", "ya", "]y", "xy", "zz", "b", "-", "^", "ab]"]
+        for pattern in patterns:
+            matcher = ExclusionMatcher([pattern], "/docs")
+            for path in paths:
+                self.assertEqual(
+                    matcher.match_relative(path),
+                    fnmatch.fnmatchcase(path, pattern),
+                    (pattern, path),
+                )
+
+    def test_double_star_matches_any_leading_directories(self):
+        """Test that `**/` also matches zero directories."""
+        matcher = ExclusionMatcher(["**/drafts/**"], "/docs")
+        self.assertTrue(matcher("/docs/drafts/page.md"))
+        self.assertTrue(matcher("/docs/a/b/drafts/page.md"))
+        self.assertFalse(matcher("/docs/a/published/page.md"))
+
+    def test_decisions_are_cached(self):
+        """Test that each path is matched only once."""
+        matcher = ExclusionMatcher(["test_dir/**"], "/tmp/docs")
+        self.assertTrue(matcher("/tmp/docs/test_dir/file.md"))
+        self.assertEqual(matcher.cache, {"/tmp/docs/test_dir/file.md": True})
+        matcher.cache["/tmp/docs/test_dir/file.md"] = False
+        self.assertFalse(matcher("/tmp/docs/test_dir/file.md"))
+
+    def test_no_patterns(self):
+        """Test that nothing is excluded without patterns."""
+        self.assertFalse(ExclusionMatcher([], "/docs")("/docs/index.md"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from mkdocs_breadcrumbs_plugin.ledger import ArtifactLedger
+import os
+import tempfile
+import unittest
+
+
+class TestArtifactLedger(unittest.TestCase):
+    def test_sweep_spares_changed_files_and_busy_directories(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ledger = ArtifactLedger(os.path.join(tmp, "ledger.json"))
+            folder = os.path.join(tmp, "out")
+            os.makedirs(folder)
+            ledger.add_dir(folder)
+            for name in ("ours.md", "edited.md"):
+                with open(os.path.join(folder, name), "w") as f:
+                    f.write("# Generated")
+                ledger.add(os.path.join(folder, name))
+            with open(os.path.join(folder, "edited.md"), "w") as f:
+                f.write("# Edited by hand")
+            ledger.save()
+
+            ledger = ArtifactLedger(os.path.join(tmp, "ledger.json"))
+            ledger.load()
+            self.assertEqual(ledger.sweep(), (1, 1))
+            self.assertEqual(os.listdir(folder), ["edited.md"])
+            self.assertEqual(ledger.files, {})
+            self.assertEqual(ledger.dirs, {folder})
+
+            os.remove(os.path.join(folder, "edited.md"))
+            self.assertEqual(ledger.sweep(), (0, 0))
+            self.assertFalse(os.path.exists(folder))
+            self.assertEqual(ledger.dirs, set())
+
+    def test_existing_files_are_only_recorded_when_owned(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            ledger = ArtifactLedger(os.path.join(tmp, "ledger.json"))
+            path = os.path.join(tmp, "page.md")
+            with open(path, "w") as f:
+                f.write("# Replaced a hand-written page")
+            self.assertFalse(ledger.add(path, existed=True))
+            self.assertEqual(ledger.sweep(), (0, 0))
+            self.assertTrue(os.path.exists(path))
+
+            self.assertTrue(ledger.add(path))
+            with open(path, "w") as f:
+                f.write("# Rewritten")
+            self.assertTrue(ledger.add(path, existed=True))
+            self.assertEqual(ledger.sweep(), (1, 0))
+            self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
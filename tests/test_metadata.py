@@ -0,0 +1,60 @@
+from mkdocs_breadcrumbs_plugin.metadata import PageMetaCache, read_page_meta
+from unittest import mock
+import os
+import tempfile
+import unittest
+
+
+class TestPageMeta(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.page = os.path.join(self.tmp.name, "page.md")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, content):
+        with open(self.page, "w") as f:
+            f.write(content)
+
+    def test_front_matter_title_and_description(self):
+        self.write("---\ntitle: Setup\ndescription: How to  install\n---\n# Other\n")
+        self.assertEqual(read_page_meta(self.page), ("Setup", "How to install"))
+
+    def test_first_heading_is_the_fallback_title(self):
+        self.write("---\nauthor: me\n---\nIntro\n\n## Sub\n# Real Title #\n")
+        self.assertEqual(read_page_meta(self.page), ("Real Title", None))
+        self.write("no heading at all")
+        self.assertEqual(read_page_meta(self.page), (None, None))
+
+    def test_only_the_head_is_read(self):
+        """Test that a heading beyond the head of the file is not found."""
+        self.write("x\n" * 100 + "# Late\n")
+        self.assertEqual(read_page_meta(self.page, head_size=64), (None, None))
+        self.assertEqual(read_page_meta(self.page), ("Late", None))
+
+    def test_cache_rereads_changed_files_only(self):
+        cache_path = os.path.join(self.tmp.name, "cache", "page_meta.json")
+        self.write("# First")
+        cache = PageMetaCache(cache_path)
+        self.assertEqual(cache.get(self.page), ("First", None))
+        cache.save()
+
+        cache = PageMetaCache(cache_path)
+        cache.load()
+        with mock.patch("mkdocs_breadcrumbs_plugin.metadata.read_page_meta") as read:
+            self.assertEqual(cache.get(self.page), ("First", None))
+            self.assertTrue(cache.is_current(self.page))
+        read.assert_not_called()
+
+        self.write("# Second, longer")
+        self.assertFalse(cache.is_current(self.page))
+        self.assertEqual(cache.get(self.page), ("Second, longer", None))
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(
+            cache.get(os.path.join(self.tmp.name, "gone.md")), (None, None)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
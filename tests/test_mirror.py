@@ -0,0 +1,95 @@
+from mkdocs_breadcrumbs_plugin.mirror import Mirror
+import os
+import tempfile
+import unittest
+
+
+class TestMirror(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = os.path.join(self.tmp.name, "src.md")
+        self.dest = os.path.join(self.tmp.name, "dest.md")
+        with open(self.src, "w") as f:
+            f.write("# Source")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_copy_then_unchanged_then_updated(self):
+        """Test that copies are skipped until the source changes."""
+        mirror = Mirror()
+        self.assertEqual(mirror.sync(self.src, self.dest), "copied")
+        self.assertEqual(mirror.sync(self.src, self.dest), "unchanged")
+
+        with open(self.src, "w") as f:
+            f.write("# Source, edited")
+        os.utime(self.src, ns=(0, os.stat(self.dest).st_mtime_ns + 10**9))
+        self.assertEqual(mirror.sync(self.src, self.dest), "copied")
+        with open(self.dest) as f:
+            self.assertEqual(f.read(), "# Source, edited")
+
+        self.assertEqual(mirror.stats.copied, 2)
+        self.assertEqual(mirror.stats.unchanged, 1)
+        self.assertEqual(mirror.stats.bytes_copied, 8 + 16)
+        self.assertEqual(mirror.stats.bytes_saved, 8)
+
+    def test_newer_destination_is_kept(self):
+        """Test that a newer, different destination is never overwritten."""
+        with open(self.dest, "w") as f:
+            f.write("# Hand written")
+        os.utime(self.src, ns=(0, 0))
+        mirror = Mirror()
+        self.assertEqual(mirror.sync(self.src, self.dest), "kept")
+        with open(self.dest) as f:
+            self.assertEqual(f.read(), "# Hand written")
+
+    def test_existing_destination_is_only_replaced_when_owned(self):
+        """Test that an older destination is kept unless a mirror placed it."""
+        with open(self.dest, "w") as f:
+            f.write("# Hand written")
+        os.utime(self.dest, ns=(0, 0))
+        self.assertEqual(Mirror().sync(self.src, self.dest), "kept")
+        with open(self.dest) as f:
+            self.assertEqual(f.read(), "# Hand written")
+
+        os.remove(self.dest)
+        owned = {}
+        self.assertEqual(Mirror(owned=owned).sync(self.src, self.dest), "copied")
+        self.assertIn(self.dest, owned)
+        with open(self.src, "w") as f:
+            f.write("# Source, edited")
+        mirror = Mirror(owned=owned)
+        self.assertEqual(mirror.sync(self.src, self.dest), "copied")
+        self.assertTrue(mirror.remove(self.dest))
+        self.assertFalse(os.path.exists(self.dest))
+
+    def test_hardlink(self):
+        """Test that hardlink mode shares the inode instead of copying."""
+        mirror = Mirror("hardlink")
+        self.assertEqual(mirror.sync(self.src, self.dest), "linked")
+        self.assertTrue(os.path.samefile(self.src, self.dest))
+        self.assertEqual(mirror.stats.bytes_copied, 0)
+        self.assertEqual(mirror.stats.bytes_saved, 8)
+
+    def test_symlink(self):
+        """Test that symlink mode points at the absolute source path."""
+        mirror = Mirror("symlink")
+        self.assertEqual(mirror.sync(self.src, self.dest), "linked")
+        self.assertEqual(os.readlink(self.dest), os.path.abspath(self.src))
+        self.assertEqual(mirror.sync(self.src, self.dest), "unchanged")
+
+    def test_reflink_falls_back_to_copy(self):
+        """Test that reflink mode always produces the file's content."""
+        mirror = Mirror("reflink")
+        self.assertIn(mirror.sync(self.src, self.dest), ("linked", "copied"))
+        with open(self.dest) as f:
+            self.assertEqual(f.read(), "# Source")
+
+    def test_invalid_mode(self):
+        """Test that unknown modes are rejected."""
+        with self.assertRaises(ValueError):
+            Mirror("move")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,10 @@
 from mkdocs_breadcrumbs_plugin.plugin import BreadCrumbs
+from mkdocs_breadcrumbs_plugin.scanner import list_directory
+from mkdocs.structure.files import File, Files
+import json
 import os
 import sys
+import tempfile
 import unittest
 import logging
 from unittest import mock
@@ -22,6 +26,8 @@ class TestBreadcrumbsPlugin(unittest.TestCase):
             "site_name": "Test Site",
             "site_url": "http://example.com/",
             "docs_dir": "docs",
+            "site_dir": "site",
+            "use_directory_urls": True,
         }
 
         # Default plugin config - adjusted to match actual plugin options
@@ -31,8 +37,25 @@ class TestBreadcrumbsPlugin(unittest.TestCase):
             "exclude_paths": ["docs/mkdocs/**", "docs/index.md"],
             "additional_index_folders": [],
             "generate_home_index": True,
+            "home_index_depth": 3,
             "use_page_titles": False,
             "log_level": "INFO",
+            "log_summary": False,
+            "virtual_index_pages": False,
+            "output": "markdown",
+            "json_ld": False,
+            "breadcrumbs_json": "",
+            "mirror_mode": "copy",
+            "rich_index": False,
+            "index_page_size": 0,
+            "workers": 1,
+            "incremental": False,
+            "cache_breadcrumbs": False,
+            "cleanup_artifacts": False,
+            "watch_debounce": 0.1,
+            "cache_dir": ".cache/breadcrumbs",
+            "profile": False,
+            "profile_json": "",
         }
 
         # Create a mock page
@@ -134,13 +157,12 @@ class TestBreadcrumbsPlugin(unittest.TestCase):
 
     def test_is_path_excluded(self):
         """Test path exclusion functionality."""
+        # Test excluded paths, compiled in on_config
         self.plugin.config = deepcopy(self.default_config)
+        self.plugin.config["exclude_paths"] = ["test_dir/**"]
+        self.mkdocs_config["docs_dir"] = "/tmp/docs"
         self.plugin.on_config(self.mkdocs_config)
 
-        # Test excluded paths
-        self.plugin.exclude_paths = ["test_dir/**"]
-        self.plugin.docs_dir = "/tmp/docs"
-
         # Should be excluded
         self.assertTrue(self.plugin._is_path_excluded("/tmp/docs/test_dir/file.md"))
         self.assertTrue(
@@ -264,6 +286,897 @@ class TestBreadcrumbsPlugin(unittest.TestCase):
         self.assertIn("[child](/parent/child)", result)
         self.assertIn("[nested-page](/parent/child/nested-page)", result)
 
+    def test_virtual_index_pages(self):
+        """Test that virtual index pages are added in memory, not on disk."""
+        custom_config = deepcopy(self.default_config)
+        custom_config["virtual_index_pages"] = True
+        self.plugin.config = custom_config
+
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_dir = os.path.join(tmp, "docs")
+            os.makedirs(os.path.join(docs_dir, "guide", "deep"))
+            with open(os.path.join(docs_dir, "guide", "intro.md"), "w") as f:
+                f.write("# Intro")
+            extra_dir = os.path.join(tmp, "extra")
+            os.makedirs(os.path.join(extra_dir, "api"))
+            with open(os.path.join(extra_dir, "api", "ref.md"), "w") as f:
+                f.write("# Ref")
+
+            self.mkdocs_config["docs_dir"] = docs_dir
+            custom_config["additional_index_folders"] = [extra_dir]
+            self.plugin.on_config(self.mkdocs_config)
+
+            config = mock.MagicMock()
+            config.site_dir = os.path.join(tmp, "site")
+            config.use_directory_urls = True
+            config.plugins._current_plugin = "breadcrumbs"
+            files = Files([])
+            files = self.plugin.on_files(files, config)
+
+            self.assertIn("guide/index.md", files)
+            self.assertIn("guide/deep/index.md", files)
+            self.assertIn("api/ref.md", files)
+            self.assertIn("api/index.md", files)
+            self.assertFalse(
+                os.path.exists(os.path.join(docs_dir, "guide", "index.md"))
+            )
+            self.assertFalse(os.path.exists(os.path.join(docs_dir, "api")))
+
+            content = files.get_file_from_path("guide/index.md").content_string
+            self.assertIn("# Index of guide", content)
+            self.assertIn("- [intro](/guide/intro/)", content)
+            self.assertIn("- [deep](/guide/deep/)", content)
+            self.assertEqual(
+                files.get_file_from_path("api/ref.md").content_string, "# Ref"
+            )
+            home = files.get_file_from_path("index.md").content_string
+            self.assertIn('<li><a href="/api/ref/">ref</a></li>', home)
+            self.assertIn('<li><a href="/guide/intro/">intro</a></li>', home)
+
+    def test_home_index(self):
+        """Test that the home index nests docs_dir and the additional folders
+        down to the depth limit, without excluded paths."""
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_dir = os.path.join(tmp, "docs")
+            extra_dir = os.path.join(tmp, "extra")
+            for path in (
+                "docs/guide/deep/deeper/x.md",
+                "docs/guide/intro.md",
+                "docs/guide/secret.md",
+                "docs/mkdocs/skip.md",
+                "docs/top.md",
+                "extra/guide/ref.md",
+            ):
+                os.makedirs(os.path.dirname(os.path.join(tmp, path)), exist_ok=True)
+                with open(os.path.join(tmp, path), "w") as f:
+                    f.write("# Page")
+            self.mkdocs_config["docs_dir"] = docs_dir
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+            self.plugin.config = deepcopy(self.default_config)
+            self.plugin.config["additional_index_folders"] = [extra_dir]
+            self.plugin.config["home_index_depth"] = 2
+            self.plugin.config["exclude_paths"] = [
+                "docs/mkdocs/**",
+                "docs/mkdocs",
+                "docs/guide/secret.md",
+            ]
+            self.plugin.on_config(self.mkdocs_config)
+            with mock.patch(
+                "mkdocs_breadcrumbs_plugin.scanner.list_directory",
+                wraps=list_directory,
+            ) as listed:
+                self.plugin.on_files(Files([]), self.mkdocs_config)
+            listed_paths = [call.args[0] for call in listed.call_args_list]
+            self.assertEqual(len(listed_paths), len(set(listed_paths)))
+
+            with open(os.path.join(docs_dir, "index.md")) as f:
+                self.assertEqual(
+                    f.read(),
+                    "# Index of .\n\n"
+                    '<ul class="breadcrumbs-home-index">\n'
+                    '<li><details><summary><a href="/guide/">guide</a></summary>\n'
+                    "<ul>\n"
+                    '<li><a href="/guide/deep/">deep</a></li>\n'
+                    '<li><a href="/guide/intro/">intro</a></li>\n'
+                    '<li><a href="/guide/ref/">ref</a></li>\n'
+                    "</ul>\n"
+                    "</details></li>\n"
+                    '<li><a href="/top/">top</a></li>\n'
+                    "</ul>",
+                )
+
+    def test_home_index_is_skipped_while_nothing_changed(self):
+        """Test that the home index is only rebuilt when a listing changed,
+        both on incremental builds and on serve events."""
+        from watchdog.events import FileCreatedEvent, FileModifiedEvent
+
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_dir = os.path.join(tmp, "docs")
+            extra_dir = os.path.join(tmp, "extra")
+            os.makedirs(os.path.join(docs_dir, "guide"))
+            os.makedirs(os.path.join(extra_dir, "api"))
+            for path in ("docs/guide/intro.md", "extra/api/ref.md"):
+                with open(os.path.join(tmp, path), "w") as f:
+                    f.write("# Page")
+            self.mkdocs_config["docs_dir"] = docs_dir
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+
+            def build():
+                plugin = BreadCrumbs()
+                plugin.config = deepcopy(self.default_config)
+                plugin.config["additional_index_folders"] = [extra_dir]
+                plugin.config["incremental"] = True
+                plugin.on_config(self.mkdocs_config)
+                with mock.patch.object(
+                    plugin, "_home_index_items", wraps=plugin._home_index_items
+                ) as items:
+                    plugin.on_files(Files([]), self.mkdocs_config)
+                return plugin, items.called
+
+            self.assertTrue(build()[1])
+            self.assertFalse(build()[1])
+            with open(os.path.join(docs_dir, "guide", "more.md"), "w") as f:
+                f.write("# More")
+            os.utime(os.path.join(docs_dir, "guide"), ns=(0, 1))
+            self.assertTrue(build()[1])
+            with open(os.path.join(docs_dir, "index.md")) as f:
+                self.assertIn('<a href="/guide/more/">more</a>', f.read())
+
+            plugin = build()[0]
+            server = mock.MagicMock()
+            plugin.on_serve(server, self.mkdocs_config, None)
+            handler = server.observer.schedule.call_args.args[0]
+            ref = os.path.join(extra_dir, "api", "ref.md")
+            with open(ref, "w") as f:
+                f.write("# Edited")
+            with mock.patch.object(
+                plugin, "_home_index_items", wraps=plugin._home_index_items
+            ) as items:
+                handler.callback([FileModifiedEvent(ref)])
+                items.assert_not_called()
+                new_page = os.path.join(extra_dir, "api", "new.md")
+                with open(new_page, "w") as f:
+                    f.write("# New")
+                handler.callback([FileCreatedEvent(new_page)])
+                items.assert_called()
+            with open(os.path.join(docs_dir, "index.md")) as f:
+                self.assertIn('<a href="/api/new/">new</a>', f.read())
+
+    def test_generate_index_pages_keeps_existing_index(self):
+        """Test that index generation never overwrites an existing index.md."""
+        self.plugin.config = deepcopy(self.default_config)
+        self.plugin.on_config(self.mkdocs_config)
+
+        with tempfile.TemporaryDirectory() as docs_dir:
+            os.makedirs(os.path.join(docs_dir, "a", "b"))
+            with open(os.path.join(docs_dir, "a", "b", "index.md"), "w") as f:
+                f.write("# Hand written")
+            with open(os.path.join(docs_dir, "a", "b", "page.md"), "w") as f:
+                f.write("# Page")
+            self.plugin.docs_dir = docs_dir
+
+            self.plugin._generate_index_pages(docs_dir)
+
+            with open(os.path.join(docs_dir, "a", "b", "index.md")) as f:
+                self.assertEqual(f.read(), "# Hand written")
+            with open(os.path.join(docs_dir, "a", "index.md")) as f:
+                self.assertEqual(f.read(), "# Index of a\n\n- [b](/a/b/)")
+
+    def test_incremental_regenerates_changed_folders_only(self):
+        """Test that rebuilds only rescan and regenerate changed folders."""
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_dir = os.path.join(tmp, "docs")
+            for folder in ("a", "b"):
+                os.makedirs(os.path.join(docs_dir, folder))
+                with open(os.path.join(docs_dir, folder, "page.md"), "w") as f:
+                    f.write("# Page")
+            with open(os.path.join(docs_dir, "index.md"), "w") as f:
+                f.write("# Home")
+            self.mkdocs_config["docs_dir"] = docs_dir
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+
+            def build():
+                plugin = BreadCrumbs()
+                plugin.config = deepcopy(self.default_config)
+                plugin.config["incremental"] = True
+                plugin.on_config(self.mkdocs_config)
+                with mock.patch(
+                    "mkdocs_breadcrumbs_plugin.scanner.list_directory",
+                    wraps=list_directory,
+                ) as listed:
+                    plugin.on_files(Files([]), self.mkdocs_config)
+                return sorted(call.args[0] for call in listed.call_args_list)
+
+            self.assertEqual(len(build()), 3)
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(tmp, ".cache", "breadcrumbs", "manifest.json")
+                )
+            )
+            self.assertEqual(build(), [])
+
+            with open(os.path.join(docs_dir, "b", "new.md"), "w") as f:
+                f.write("# New")
+            os.utime(os.path.join(docs_dir, "b"), ns=(0, 1))
+            self.assertEqual(build(), [os.path.join(docs_dir, "b")])
+            with open(os.path.join(docs_dir, "b", "index.md")) as f:
+                self.assertIn("- [new](/b/new/)", f.read())
+
+            # Hand-edited indexes are left alone
+            with open(os.path.join(docs_dir, "a", "index.md"), "w") as f:
+                f.write("# Mine")
+            with open(os.path.join(docs_dir, "a", "other.md"), "w") as f:
+                f.write("# Other")
+            os.utime(os.path.join(docs_dir, "a"), ns=(0, 2))
+            build()
+            with open(os.path.join(docs_dir, "a", "index.md")) as f:
+                self.assertEqual(f.read(), "# Mine")
+
+    def test_rich_index_lists_titles(self):
+        """Test that rich indexes list page titles and follow title edits."""
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_dir = os.path.join(tmp, "docs")
+            os.makedirs(os.path.join(docs_dir, "guide"))
+            page_path = os.path.join(docs_dir, "guide", "setup.md")
+            with open(page_path, "w") as f:
+                f.write("---\ntitle: Setup [beta]\ndescription: Install it\n---\n")
+            with open(os.path.join(docs_dir, "guide", "faq.md"), "w") as f:
+                f.write("# Questions")
+            self.mkdocs_config["docs_dir"] = docs_dir
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+
+            def build():
+                plugin = BreadCrumbs()
+                plugin.config = deepcopy(self.default_config)
+                plugin.config["incremental"] = True
+                plugin.config["rich_index"] = True
+                plugin.on_config(self.mkdocs_config)
+                plugin.on_files(Files([]), self.mkdocs_config)
+                plugin.on_post_build(self.mkdocs_config)
+                with open(os.path.join(docs_dir, "guide", "index.md")) as f:
+                    return f.read()
+
+            self.assertEqual(
+                build(),
+                "# Index of guide\n\n- [Questions](/guide/faq/)\n"
+                "- [Setup \\[beta\\]](/guide/setup/) - Install it",
+            )
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(tmp, ".cache", "breadcrumbs", "page_meta.json")
+                )
+            )
+
+            # Editing a page does not touch the directory mtime
+            with open(page_path, "w") as f:
+                f.write("# Installation")
+            self.assertIn("- [Installation](/guide/setup/)\n", build() + "\n")
+
+            # Turning rich indexes off lists plain names again
+            plugin = BreadCrumbs()
+            plugin.config = deepcopy(self.default_config)
+            plugin.config["incremental"] = True
+            plugin.on_config(self.mkdocs_config)
+            plugin.on_files(Files([]), self.mkdocs_config)
+            with open(os.path.join(docs_dir, "guide", "index.md")) as f:
+                self.assertIn("- [setup](/guide/setup/)", f.read())
+
+    def test_incremental_follows_index_settings(self):
+        """Test that changing an index setting regenerates unchanged folders."""
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_dir = os.path.join(tmp, "docs")
+            os.makedirs(os.path.join(docs_dir, "big"))
+            for i in range(3):
+                with open(os.path.join(docs_dir, "big", f"p{i}.md"), "w") as f:
+                    f.write("# Page")
+            self.mkdocs_config["docs_dir"] = docs_dir
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+
+            def build(**options):
+                plugin = BreadCrumbs()
+                plugin.config = deepcopy(self.default_config)
+                plugin.config["incremental"] = True
+                plugin.config.update(options)
+                plugin.on_config(self.mkdocs_config)
+                plugin.on_files(Files([]), self.mkdocs_config)
+                return sorted(os.listdir(os.path.join(docs_dir, "big")))
+
+            self.assertNotIn("index-2.md", build())
+            self.assertIn("index-2.md", build(index_page_size=2))
+
+    def test_additional_index_folders_are_mirrored(self):
+        """Test that additional folders are mirrored and kept in sync."""
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_dir = os.path.join(tmp, "docs")
+            extra_dir = os.path.join(tmp, "extra")
+            os.makedirs(docs_dir)
+            os.makedirs(os.path.join(extra_dir, "api"))
+            src_path = os.path.join(extra_dir, "api", "ref.md")
+            with open(src_path, "w") as f:
+                f.write("# Ref")
+            self.mkdocs_config["docs_dir"] = docs_dir
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+            self.plugin.config = deepcopy(self.default_config)
+            self.plugin.config["additional_index_folders"] = [extra_dir]
+            self.plugin.on_config(self.mkdocs_config)
+
+            self.plugin.on_files(Files([]), self.mkdocs_config)
+            # The root index maps to the excluded docs/index.md
+            self.assertEqual(self.plugin.mirror.stats.copied, 2)
+            with open(os.path.join(docs_dir, "api", "index.md")) as f:
+                self.assertIn("- [ref](/api/ref/)", f.read())
+
+            with open(src_path, "w") as f:
+                f.write("# Ref, edited")
+            os.utime(src_path, ns=(0, os.stat(src_path).st_mtime_ns + 10**9))
+            self.plugin.on_files(Files([]), self.mkdocs_config)
+            self.assertEqual(self.plugin.mirror.stats.copied, 1)
+            self.assertEqual(self.plugin.mirror.stats.unchanged, 1)
+            with open(os.path.join(docs_dir, "api", "ref.md")) as f:
+                self.assertEqual(f.read(), "# Ref, edited")
+
+    def test_generated_pages_join_the_build(self):
+        """Test that pages written to docs_dir during on_files are added to the
+        files of the same build, even when they are cleaned up afterwards."""
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_dir = os.path.join(tmp, "docs")
+            extra_dir = os.path.join(tmp, "extra")
+            os.makedirs(os.path.join(docs_dir, "guide"))
+            os.makedirs(os.path.join(extra_dir, "api"))
+            for path in ("docs/guide/page.md", "extra/api/ref.md"):
+                with open(os.path.join(tmp, path), "w") as f:
+                    f.write("# Page")
+            self.mkdocs_config["docs_dir"] = docs_dir
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+
+            for _ in range(2):
+                plugin = BreadCrumbs()
+                plugin.config = deepcopy(self.default_config)
+                plugin.config["additional_index_folders"] = [extra_dir]
+                plugin.config["cleanup_artifacts"] = True
+                plugin.on_config(self.mkdocs_config)
+                page = File("guide/page.md", docs_dir, "site", True)
+                files = plugin.on_files(Files([page]), self.mkdocs_config)
+                self.assertEqual(
+                    sorted(files.src_uris),
+                    [
+                        "api/index.md",
+                        "api/ref.md",
+                        "guide/index.md",
+                        "guide/page.md",
+                        "index.md",
+                    ],
+                )
+                self.assertEqual(files.get_file_from_path("api/ref.md").url, "api/ref/")
+                plugin.on_post_build(self.mkdocs_config)
+                self.assertEqual(os.listdir(docs_dir), ["guide"])
+
+    def test_cleanup_artifacts(self):
+        """Test that only unchanged generated files are removed after the build
+        and that artifacts of an interrupted run are swept on startup."""
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_dir = os.path.join(tmp, "docs")
+            extra_dir = os.path.join(tmp, "extra")
+            os.makedirs(os.path.join(docs_dir, "guide"))
+            os.makedirs(os.path.join(extra_dir, "api"))
+            for path in ("docs/guide/page.md", "extra/api/ref.md", "extra/api/old.md"):
+                with open(os.path.join(tmp, path), "w") as f:
+                    f.write("# Page")
+            self.mkdocs_config["docs_dir"] = docs_dir
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+
+            def build():
+                plugin = BreadCrumbs()
+                plugin.config = deepcopy(self.default_config)
+                plugin.config["additional_index_folders"] = [extra_dir]
+                plugin.config["cleanup_artifacts"] = True
+                plugin.on_startup(command="build", dirty=False)
+                plugin.on_config(self.mkdocs_config)
+                plugin.on_files(Files([]), self.mkdocs_config)
+                return plugin
+
+            plugin = build()
+            guide_index = os.path.join(docs_dir, "guide", "index.md")
+            self.assertTrue(os.path.exists(os.path.join(docs_dir, "api", "ref.md")))
+            with open(guide_index, "w") as f:
+                f.write("# Edited by hand")
+            # A copy touched since the mirror placed it counts as hand-edited
+            old_copy = os.path.join(docs_dir, "api", "old.md")
+            os.utime(old_copy, ns=(0, os.stat(old_copy).st_mtime_ns + 10**9))
+            plugin.on_post_build(self.mkdocs_config)
+
+            self.assertFalse(os.path.exists(os.path.join(docs_dir, "api", "ref.md")))
+            self.assertFalse(os.path.exists(os.path.join(extra_dir, "api", "index.md")))
+            self.assertTrue(os.path.exists(old_copy))
+            with open(guide_index) as f:
+                self.assertEqual(f.read(), "# Edited by hand")
+            self.assertTrue(os.path.exists(os.path.join(docs_dir, "guide", "page.md")))
+            self.assertTrue(os.path.exists(os.path.join(extra_dir, "api", "ref.md")))
+
+            # Interrupted before on_post_build: the next run sweeps first
+            os.remove(old_copy)
+            build()
+            self.assertTrue(os.path.exists(os.path.join(docs_dir, "api", "ref.md")))
+            plugin = BreadCrumbs()
+            plugin.config = deepcopy(self.default_config)
+            plugin.config["cleanup_artifacts"] = True
+            plugin.on_config(self.mkdocs_config)
+            self.assertFalse(os.path.exists(os.path.join(docs_dir, "api")))
+            self.assertTrue(os.path.exists(os.path.join(docs_dir, "guide", "page.md")))
+
+    def test_serve_regenerates_changed_folders(self):
+        """Test that serve events only update the touched directories of an
+        additional folder and that rebuilds leave the folder alone."""
+        from watchdog.events import (
+            DirCreatedEvent,
+            DirMovedEvent,
+            FileCreatedEvent,
+            FileDeletedEvent,
+        )
+
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_dir = os.path.join(tmp, "docs")
+            extra_dir = os.path.join(tmp, "extra")
+            os.makedirs(docs_dir)
+            for folder in ("api", "guide"):
+                os.makedirs(os.path.join(extra_dir, folder))
+                with open(os.path.join(extra_dir, folder, "page.md"), "w") as f:
+                    f.write("# Page")
+            self.mkdocs_config["docs_dir"] = docs_dir
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+            self.plugin.config = deepcopy(self.default_config)
+            self.plugin.config["additional_index_folders"] = [extra_dir]
+            self.plugin.on_config(self.mkdocs_config)
+            self.plugin.on_files(Files([]), self.mkdocs_config)
+
+            server = mock.MagicMock()
+            self.plugin.on_serve(server, self.mkdocs_config, None)
+            handler = server.observer.schedule.call_args.args[0]
+            self.assertEqual(server.observer.schedule.call_args.args[1], extra_dir)
+
+            new_page = os.path.join(extra_dir, "api", "new.md")
+            with open(new_page, "w") as f:
+                f.write("# New")
+            os.makedirs(os.path.join(extra_dir, "ref", "deep"))
+            with open(os.path.join(extra_dir, "ref", "deep", "x.md"), "w") as f:
+                f.write("# X")
+            with mock.patch(
+                "mkdocs_breadcrumbs_plugin.scanner.list_directory",
+                wraps=list_directory,
+            ) as listed:
+                handler.callback(
+                    [
+                        FileCreatedEvent(new_page),
+                        DirCreatedEvent(os.path.join(extra_dir, "ref")),
+                    ]
+                )
+            self.assertNotIn(
+                os.path.join(extra_dir, "guide"),
+                [call.args[0] for call in listed.call_args_list],
+            )
+            with open(os.path.join(docs_dir, "api", "index.md")) as f:
+                self.assertIn("- [new](/api/new/)", f.read())
+            # The root index maps to the excluded docs/index.md
+            with open(os.path.join(extra_dir, "index.md")) as f:
+                self.assertIn("- [ref](/./ref/)", f.read())
+            self.assertTrue(
+                os.path.exists(os.path.join(docs_dir, "ref", "deep", "x.md"))
+            )
+            with open(os.path.join(docs_dir, "ref", "deep", "index.md")) as f:
+                self.assertIn("- [x](/ref/deep/x/)", f.read())
+
+            # Copies of deleted or moved away sources are removed
+            os.remove(new_page)
+            os.rename(os.path.join(extra_dir, "ref"), os.path.join(tmp, "ref"))
+            handler.callback(
+                [
+                    FileDeletedEvent(new_page),
+                    DirMovedEvent(
+                        os.path.join(extra_dir, "ref"), os.path.join(tmp, "ref")
+                    ),
+                ]
+            )
+            self.assertFalse(os.path.exists(os.path.join(docs_dir, "api", "new.md")))
+            self.assertFalse(
+                os.path.exists(os.path.join(docs_dir, "ref", "deep", "x.md"))
+            )
+            with open(os.path.join(docs_dir, "api", "index.md")) as f:
+                self.assertNotIn("new", f.read())
+            with open(os.path.join(extra_dir, "index.md")) as f:
+                self.assertNotIn("ref", f.read())
+
+            self.plugin.on_config(self.mkdocs_config)
+            with mock.patch.object(self.plugin, "_copy_all_to_docs") as copy:
+                self.plugin.on_files(Files([]), self.mkdocs_config)
+            copy.assert_not_called()
+
+    def test_mirror_keeps_hand_written_pages(self):
+        """Test that an existing docs page the mirror did not place survives,
+        however old it is, and is never recorded for cleanup."""
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_dir = os.path.join(tmp, "docs")
+            extra_dir = os.path.join(tmp, "extra")
+            os.makedirs(docs_dir)
+            os.makedirs(extra_dir)
+            hand_written = os.path.join(docs_dir, "guide.md")
+            with open(hand_written, "w") as f:
+                f.write("# Hand written")
+            os.utime(hand_written, (1577836800, 1577836800))
+            with open(os.path.join(extra_dir, "guide.md"), "w") as f:
+                f.write("# From the extra folder")
+            self.mkdocs_config["docs_dir"] = docs_dir
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+
+            for _ in range(2):
+                plugin = BreadCrumbs()
+                plugin.config = deepcopy(self.default_config)
+                plugin.config["additional_index_folders"] = [extra_dir]
+                plugin.config["cleanup_artifacts"] = True
+                plugin.on_config(self.mkdocs_config)
+                plugin.on_files(Files([]), self.mkdocs_config)
+                self.assertEqual(plugin.mirror.stats.kept, 1)
+                self.assertNotIn(hand_written, plugin.ledger.files)
+                plugin.on_post_build(self.mkdocs_config)
+                with open(hand_written) as f:
+                    self.assertEqual(f.read(), "# Hand written")
+
+    def test_parallel_index_generation(self):
+        """Test that workers generate the same index pages as a serial run."""
+
+        def build(workers):
+            with tempfile.TemporaryDirectory() as docs_dir:
+                for i in range(5):
+                    os.makedirs(os.path.join(docs_dir, f"d{i}", "sub"))
+                    with open(os.path.join(docs_dir, f"d{i}", "p.md"), "w") as f:
+                        f.write("# Page")
+                plugin = BreadCrumbs()
+                plugin.config = deepcopy(self.default_config)
+                plugin.config["workers"] = workers
+                self.mkdocs_config["docs_dir"] = docs_dir
+                plugin.on_config(self.mkdocs_config)
+                plugin.on_files(Files([]), self.mkdocs_config)
+                self.assertIsNone(plugin.executor)
+                pages = {}
+                for root, _, names in os.walk(docs_dir):
+                    with open(os.path.join(root, "index.md")) as f:
+                        pages[os.path.relpath(root, docs_dir)] = f.read()
+                return pages
+
+        self.assertEqual(build(4), build(1))
+
+    def test_page_titles_memoize_sections(self):
+        """Test that section crumbs are rendered once and shared by pages."""
+        custom_config = deepcopy(self.default_config)
+        custom_config["use_page_titles"] = True
+        self.plugin.config = custom_config
+        self.plugin.on_config(self.mkdocs_config)
+
+        def item(title, parent, is_page):
+            nav_item = mock.MagicMock()
+            nav_item.title = title
+            nav_item.url = title.lower() + "/"
+            nav_item.is_homepage = False
+            nav_item.is_page = is_page
+            nav_item.is_section = not is_page
+            nav_item.parent = parent
+            nav_item.children = [] if not is_page else None
+            return nav_item
+
+        guide = item("Guide", None, False)
+        advanced = item("Advanced", guide, False)
+        guide.children.append(advanced)
+        pages = [item(f"Page{i}", advanced, True) for i in range(3)]
+        advanced.children.extend(pages)
+        nav = mock.MagicMock()
+        nav.items = [guide]
+        self.plugin.on_nav(nav, self.mkdocs_config, None)
+        self.assertEqual(len(self.plugin.nav_index.nodes), 2)
+        self.assertEqual(len(self.plugin.nav_index.pages), 3)
+
+        with mock.patch.object(
+            self.plugin, "_title_crumb", wraps=self.plugin._title_crumb
+        ) as title_crumb:
+            results = [
+                self.plugin.on_page_markdown(
+                    "# Content", page, self.mkdocs_config, None
+                )
+                for page in pages
+            ]
+        title_crumb.assert_not_called()
+        for result in results:
+            self.assertEqual(result, "[Home](/) / Guide / Advanced\n# Content")
+
+    def test_breadcrumb_cache_across_builds(self):
+        """Test that cached URL breadcrumbs skip the crumb trie, feed every
+        output and drop pages that disappeared."""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.mkdocs_config["docs_dir"] = tmp
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+            other_page = deepcopy(self.page)
+            other_page.url = "other/page/"
+
+            def build(pages, cache):
+                plugin = BreadCrumbs()
+                plugin.config = deepcopy(self.default_config)
+                plugin.config["cache_breadcrumbs"] = cache
+                plugin.config["json_ld"] = True
+                plugin.on_config(self.mkdocs_config)
+                plugin.on_files(Files([]), self.mkdocs_config)
+                results = []
+                for page in pages:
+                    context = plugin.on_page_context({}, page, self.mkdocs_config, None)
+                    results.append(
+                        (
+                            plugin.on_page_markdown(
+                                "# C", page, self.mkdocs_config, None
+                            ),
+                            context,
+                            plugin.on_post_page(
+                                "<head></head>", page, self.mkdocs_config
+                            ),
+                        )
+                    )
+                plugin.on_post_build(self.mkdocs_config)
+                return results, plugin
+
+            expected, _ = build([self.page, other_page], False)
+            first, _ = build([self.page, other_page], True)
+            self.assertEqual(first, expected)
+            second, plugin = build([self.page], True)
+            self.assertEqual(second, expected[:1])
+            self.assertIsNone(plugin.crumb_trie)
+
+            with open(plugin.breadcrumb_cache.path) as f:
+                self.assertEqual(list(json.load(f)["pages"]), ["test-page/"])
+
+    def test_breadcrumb_cache_follows_the_nav(self):
+        """Test that cached title breadcrumbs skip the nav index until the
+        nav changes."""
+        with tempfile.TemporaryDirectory() as tmp:
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+
+            def build(section_title):
+                guide = mock.MagicMock()
+                guide.title = section_title
+                guide.is_page = False
+                guide.is_section = True
+                guide.parent = None
+                page = deepcopy(self.page)
+                page.parent = guide
+                page.children = None
+                guide.children = [page]
+                nav = mock.MagicMock()
+                nav.items = [guide]
+                plugin = BreadCrumbs()
+                plugin.config = deepcopy(self.default_config)
+                plugin.config["use_page_titles"] = True
+                plugin.config["cache_breadcrumbs"] = True
+                plugin.on_config(self.mkdocs_config)
+                plugin.on_nav(nav, self.mkdocs_config, None)
+                result = plugin.on_page_markdown("# C", page, self.mkdocs_config, None)
+                plugin.on_post_build(self.mkdocs_config)
+                return result, len(plugin.nav_index.nodes)
+
+            self.assertEqual(build("Guide"), ("[Home](/) / Guide\n# C", 1))
+            self.assertEqual(build("Guide"), ("[Home](/) / Guide\n# C", 0))
+            self.assertEqual(build("Manual"), ("[Home](/) / Manual\n# C", 1))
+
+    def test_logger_setup_is_idempotent(self):
+        """Test that repeated on_config calls keep a single handler."""
+        self.plugin.config = deepcopy(self.default_config)
+        for _ in range(3):
+            self.plugin.on_config(self.mkdocs_config)
+        self.assertEqual(len(self.plugin.logger.handlers), 1)
+
+    def test_log_summary(self):
+        """Test that summary mode logs counts instead of one line per page."""
+        self.plugin.config = deepcopy(self.default_config)
+        self.plugin.config["log_summary"] = True
+        self.plugin.on_config(self.mkdocs_config)
+        logging.disable(logging.NOTSET)
+
+        with self.assertLogs(self.plugin.logger, level="INFO") as logs:
+            for _ in range(3):
+                self.plugin.on_page_markdown(
+                    "# Content", self.page, self.mkdocs_config, None
+                )
+            self.plugin.on_post_build(self.mkdocs_config)
+        self.assertEqual(
+            logs.output,
+            [
+                "INFO:mkdocs.plugins.breadcrumbs:Breadcrumbs for 3 pages, "
+                "0 index pages written, 0 unchanged"
+            ],
+        )
+
+    def test_profile(self):
+        """Test that profiling records hooks and counters into a JSON file."""
+        with tempfile.TemporaryDirectory() as tmp:
+            docs_dir = os.path.join(tmp, "docs")
+            os.makedirs(os.path.join(docs_dir, "a"))
+            self.mkdocs_config["docs_dir"] = docs_dir
+            self.mkdocs_config["config_file_path"] = os.path.join(tmp, "mkdocs.yml")
+            self.plugin.config = deepcopy(self.default_config)
+            self.plugin.config["profile"] = True
+            self.plugin.config["profile_json"] = "profile.json"
+            self.plugin.on_config(self.mkdocs_config)
+            self.plugin.on_files(Files([]), self.mkdocs_config)
+            self.plugin.on_page_markdown(
+                "# Content", self.page, self.mkdocs_config, None
+            )
+            self.plugin.on_post_build(self.mkdocs_config)
+
+            with open(os.path.join(tmp, "profile.json")) as f:
+                profile = json.load(f)
+        self.assertEqual(
+            sorted(profile["timings"]),
+            sorted(
+                [
+                    "on_config",
+                    "on_files",
+                    f"_generate_index_pages[{docs_dir}]",
+                    "_is_path_excluded",
+                    "on_page_markdown",
+                ]
+            ),
+        )
+        self.assertEqual(profile["counters"]["directories_scanned"], 2)
+        self.assertEqual(profile["counters"]["index_pages_written"], 2)
+        self.assertEqual(profile["counters"]["pages"], 1)
+
+    def test_profile_wrappers_do_not_nest(self):
+        """Test that a plugin reused across builds keeps one wrapper per method
+        and drops it once profiling is turned off."""
+        self.plugin.config = deepcopy(self.default_config)
+        self.plugin.config["profile"] = True
+        self.plugin.on_config(self.mkdocs_config)
+        first = self.plugin.profiler
+        for _ in range(2):
+            self.plugin.on_config(self.mkdocs_config)
+        self.plugin._is_path_excluded("docs/a.md")
+        self.assertEqual(self.plugin.profiler.timings["_is_path_excluded"][0], 1)
+        self.assertNotIn("_is_path_excluded", first.timings)
+
+        self.plugin.config["profile"] = False
+        self.plugin.on_config(self.mkdocs_config)
+        self.assertNotIn("_is_path_excluded", vars(self.plugin))
+
+    def test_paginated_index_pages(self):
+        """Test that large folders are split into several index pages."""
+        self.plugin.config = deepcopy(self.default_config)
+        self.plugin.config["index_page_size"] = 2
+        self.plugin.on_config(self.mkdocs_config)
+
+        with tempfile.TemporaryDirectory() as docs_dir:
+            folder = os.path.join(docs_dir, "api")
+            os.makedirs(folder)
+            for name in ("a", "b", "c", "d", "e"):
+                with open(os.path.join(folder, f"{name}.md"), "w") as f:
+                    f.write(f"# {name}")
+            self.plugin.docs_dir = docs_dir
+            self.plugin._generate_index_pages(docs_dir)
+
+            def read(name):
+                with open(os.path.join(folder, name)) as f:
+                    return f.read()
+
+            self.assertEqual(
+                read("index.md"),
+                "# Index of api (1/3)\n\n- [a](/api/a/)\n- [b](/api/b/)\n\n"
+                "[Next](/api/index-2/)",
+            )
+            self.assertEqual(
+                read("index-2.md"),
+                "# Index of api (2/3)\n\n- [c](/api/c/)\n- [d](/api/d/)\n\n"
+                "[Previous](/api/) | [Next](/api/index-3/)",
+            )
+            self.assertIn("- [e](/api/e/)", read("index-3.md"))
+
+            # Pages that are no longer needed are removed
+            for name in ("c", "d", "e"):
+                os.remove(os.path.join(folder, f"{name}.md"))
+            os.remove(os.path.join(folder, "index.md"))
+            self.plugin._generate_index_pages(docs_dir)
+            self.assertEqual(sorted(os.listdir(folder)), ["a.md", "b.md", "index.md"])
+
+    def test_context_output(self):
+        """Test that context output leaves Markdown alone and fills the context."""
+        self.plugin.config = deepcopy(self.default_config)
+        self.plugin.config["output"] = "context"
+        self.plugin.on_config(self.mkdocs_config)
+        self.page.url = "guide/a&b/"
+
+        markdown = "# Test Content"
+        result = self.plugin.on_page_markdown(
+            markdown, self.page, self.mkdocs_config, None
+        )
+        self.assertEqual(result, markdown)
+
+        context = self.plugin.on_page_context({}, self.page, self.mkdocs_config, None)
+        self.assertEqual(
+            context["breadcrumbs"],
+            [
+                {"title": "Home", "url": "/"},
+                {"title": "guide", "url": "/guide"},
+                {"title": "a&b", "url": "/guide/a&b"},
+            ],
+        )
+        self.assertEqual(
+            context["breadcrumbs_html"],
+            '<nav class="breadcrumbs" aria-label="Breadcrumbs">'
+            '<a href="/">Home</a> / <a href="/guide">guide</a> / '
+            '<a href="/guide/a&amp;b">a&amp;b</a></nav>',
+        )
+
+    def test_html_output(self):
+        """Test that html output inserts breadcrumbs into the rendered page."""
+        custom_config = deepcopy(self.default_config)
+        custom_config["output"] = "html"
+        custom_config["use_page_titles"] = True
+        self.plugin.config = custom_config
+        self.plugin.on_config(self.mkdocs_config)
+
+        section = mock.MagicMock()
+        section.title = "Section"
+        section.is_homepage = False
+        section.is_page = False
+        section.is_section = True
+        section.parent = None
+        self.page.parent = section
+
+        output = self.plugin.on_post_page(
+            '<html><body><article class="md-content">Text</article></body></html>',
+            self.page,
+            self.mkdocs_config,
+        )
+        self.assertEqual(
+            output,
+            '<html><body><article class="md-content">'
+            '<nav class="breadcrumbs" aria-label="Breadcrumbs">'
+            '<a href="/">Home</a> / <span>Section</span></nav>'
+            "Text</article></body></html>",
+        )
+
+    def test_structured_breadcrumb_export(self):
+        """Test JSON-LD per page and the site-wide breadcrumbs.json."""
+        with tempfile.TemporaryDirectory() as site_dir:
+            self.mkdocs_config["site_dir"] = site_dir
+            self.mkdocs_config["site_url"] = "http://example.com/doc/"
+            self.plugin.config = deepcopy(self.default_config)
+            self.plugin.config["json_ld"] = True
+            self.plugin.config["breadcrumbs_json"] = "breadcrumbs.json"
+            self.plugin.on_config(self.mkdocs_config)
+
+            output = self.plugin.on_post_page(
+                "<html><head></head><body></body></html>",
+                self.page,
+                self.mkdocs_config,
+            )
+            script = output.split('<script type="application/ld+json">')[1]
+            json_ld = json.loads(script.split("</script>")[0])
+            self.assertEqual(json_ld["@type"], "BreadcrumbList")
+            self.assertEqual(
+                json_ld["itemListElement"][1],
+                {
+                    "@type": "ListItem",
+                    "position": 2,
+                    "name": "test-page",
+                    "item": "http://example.com/doc/test-page",
+                },
+            )
+
+            self.plugin.on_post_build(self.mkdocs_config)
+            with open(os.path.join(site_dir, "breadcrumbs.json")) as f:
+                self.assertEqual(
+                    json.load(f),
+                    {
+                        "test-page/": [
+                            {"title": "Home", "url": "/doc/"},
+                            {"title": "test-page", "url": "/doc/test-page"},
+                        ]
+                    },
+                )
+
 
 if __name__ == "__main__":
     unittest.main()
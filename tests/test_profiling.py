@@ -0,0 +1,40 @@
+from mkdocs_breadcrumbs_plugin.profiling import Profiler
+import json
+import os
+import tempfile
+import unittest
+
+
+class TestProfiler(unittest.TestCase):
+    def test_timings_and_counters(self):
+        """Test that calls, timings and counters are recorded."""
+        profiler = Profiler()
+        with profiler.timed("on_files"):
+            pass
+        double = profiler.wrap("double", lambda value: value * 2)
+        self.assertEqual(double(2), 4)
+        self.assertEqual(double(3), 6)
+        profiler.count("pages", 5)
+        profiler.count("pages")
+
+        data = profiler.as_dict()
+        self.assertEqual(data["timings"]["on_files"]["calls"], 1)
+        self.assertEqual(data["timings"]["double"]["calls"], 2)
+        self.assertEqual(data["counters"], {"pages": 6})
+        report = profiler.report()
+        self.assertIn("on_files", report)
+        self.assertIn("pages", report)
+
+    def test_write_json(self):
+        """Test that the profile can be written as JSON."""
+        profiler = Profiler()
+        profiler.count("pages", 2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out", "profile.json")
+            profiler.write_json(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f)["counters"], {"pages": 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
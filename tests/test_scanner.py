@@ -0,0 +1,62 @@
+from mkdocs_breadcrumbs_plugin.scanner import scan_tree
+from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+class TestScanner(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = self.tmp.name
+        os.makedirs(os.path.join(self.root, "b", "deep"))
+        os.makedirs(os.path.join(self.root, "a"))
+        os.makedirs(os.path.join(self.root, "skip", "inner"))
+        for path in ("top.md", "b/page.md", "b/deep/leaf.md", "skip/x.md"):
+            with open(os.path.join(self.root, path), "w") as f:
+                f.write("# Page")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_scan_tree_model(self):
+        """Test that the tree holds sorted directories and files."""
+        tree = scan_tree(self.root)
+        self.assertEqual([child.name for child in tree.dirs], ["a", "b", "skip"])
+        self.assertEqual(tree.files, ["top.md"])
+        self.assertEqual(
+            [node.relpath for node in tree.walk()],
+            [".", "a", "b", "b/deep", "skip", "skip/inner"],
+        )
+
+    def test_scan_tree_lists_each_directory_once(self):
+        """Test that every directory is scanned exactly once."""
+        with mock.patch(
+            "mkdocs_breadcrumbs_plugin.scanner.os.scandir", wraps=os.scandir
+        ) as scandir:
+            scan_tree(self.root)
+        self.assertEqual(scandir.call_count, 6)
+
+    def test_scan_tree_excluded(self):
+        """Test that excluded directories are listed but not entered."""
+        tree = scan_tree(self.root, lambda path: path.endswith("skip"))
+        skip = tree.dirs[2]
+        self.assertEqual(skip.name, "skip")
+        self.assertFalse(skip.scanned)
+        self.assertEqual(skip.files, [])
+        self.assertNotIn("skip", [node.relpath for node in tree.walk()])
+
+    def test_scan_tree_with_executor(self):
+        """Test that a concurrent scan yields the same tree."""
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            tree = scan_tree(self.root, executor=executor)
+        serial = scan_tree(self.root)
+        self.assertEqual(
+            [(node.relpath, node.files) for node in tree.walk()],
+            [(node.relpath, node.files) for node in serial.walk()],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
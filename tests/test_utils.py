@@ -0,0 +1,48 @@
+from mkdocs_breadcrumbs_plugin.utils import write_lines_if_changed
+import hashlib
+import os
+import tempfile
+import unittest
+
+
+class TestWriteIfChanged(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "index.md")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_new_and_changed_files(self):
+        """Test that missing or different files are written."""
+        self.assertTrue(write_lines_if_changed(self.path, ["# One"])[0])
+        self.assertTrue(write_lines_if_changed(self.path, ["# Two"])[0])
+        with open(self.path) as f:
+            self.assertEqual(f.read(), "# Two")
+        self.assertEqual(os.listdir(self.tmp.name), ["index.md"])
+
+    def test_skips_identical_content(self):
+        """Test that identical content leaves the file and its mtime alone."""
+        write_lines_if_changed(self.path, ["# Same"])
+        os.utime(self.path, ns=(0, 0))
+        self.assertFalse(write_lines_if_changed(self.path, ["# Same"])[0])
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+
+    def test_write_lines_if_changed(self):
+        """Test that streamed lines are compared and written correctly."""
+        lines = [f"- entry {i}" for i in range(1000)]
+        written, digest = write_lines_if_changed(self.path, iter(lines))
+        self.assertTrue(written)
+        content = "\n".join(lines)
+        self.assertEqual(digest, hashlib.sha256(content.encode()).hexdigest())
+
+        self.assertFalse(write_lines_if_changed(self.path, iter(lines))[0])
+        for changed in (lines[:500], lines + ["- extra"], lines[:700] + ["- x"]):
+            self.assertTrue(write_lines_if_changed(self.path, iter(changed))[0])
+            with open(self.path) as f:
+                self.assertEqual(f.read(), "\n".join(changed))
+        self.assertEqual(os.listdir(self.tmp.name), ["index.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
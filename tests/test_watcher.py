@@ -0,0 +1,34 @@
+from mkdocs_breadcrumbs_plugin.watcher import DebouncedHandler
+from watchdog.events import FileClosedEvent, FileCreatedEvent, FileModifiedEvent
+import threading
+import unittest
+
+
+class TestDebouncedHandler(unittest.TestCase):
+    def test_events_are_batched(self):
+        """Test that a burst of events reaches the callback as one batch."""
+        batches = []
+        done = threading.Event()
+
+        def callback(events):
+            batches.append([event.src_path for event in events])
+            done.set()
+
+        handler = DebouncedHandler(callback, 0.05)
+        handler.dispatch(FileCreatedEvent("/src/a.md"))
+        handler.dispatch(FileClosedEvent("/src/a.md"))
+        handler.dispatch(FileModifiedEvent("/src/b.md"))
+        self.assertTrue(done.wait(5))
+        self.assertEqual(batches, [["/src/a.md", "/src/b.md"]])
+
+    def test_cancel_drops_pending_events(self):
+        batches = []
+        handler = DebouncedHandler(batches.append, 60)
+        handler.dispatch(FileCreatedEvent("/src/a.md"))
+        handler.cancel()
+        handler.flush()
+        self.assertEqual(batches, [])
+
+
+if __name__ == "__main__":
+    unittest.main()